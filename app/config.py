@@ -1,20 +1,46 @@
 from __future__ import annotations
 
 import base64
-import json
 import logging
+import re
 from functools import cached_property, lru_cache
 from typing import Any, Dict
 
+import orjson
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+logger = logging.getLogger(__name__)
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+# A numeric ADMIN_CHAT_ID entry, optionally prefixed with "chat:"/"user:".
+_ADMIN_ID_RE = re.compile(r"(?:^|[,;])\s*(?:(?:chat|user):\s*)?([-+]?\d+)\s*(?=[,;]|$)")
+_HOURS_SPLIT_RE = re.compile(r"[-–]")
+
+
+def _decode_list_or_map(value: Any) -> Any:
+    """Decode a JSON array/object string, falling back to comma-separated items."""
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text:
+        return []
+    if text[0] in "[{":
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return [part.strip() for part in text.split(",") if part.strip()]
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=True,
+        frozen=True,
     )
 
     telegram_bot_token: str = Field(alias="TELEGRAM_BOT_TOKEN")
@@ -29,6 +55,7 @@ class Settings(BaseSettings):
     sheets_time_format: str = Field(
         default="%Y-%m-%d %H:%M:%S", alias="SHEETS_TIME_FORMAT"
     )
+    sheets_read_cache_ttl: int = Field(default=30, alias="SHEETS_READ_CACHE_TTL")
     port: int = Field(default=8000, alias="PORT")
     leads_upsert: bool = Field(default=False, alias="LEADS_UPSERT")
     reminder_enabled: bool = Field(default=False, alias="REMINDER_ENABLED")
@@ -102,31 +129,9 @@ class Settings(BaseSettings):
         if not raw_value:
             return ()
         if isinstance(raw_value, (list, tuple)):
-            values = [str(item).strip() for item in raw_value]
-        else:
-            values = [part.strip() for part in str(raw_value).replace(";", ",").split(",")]
-        result: list[int] = []
-        for item in values:
-            if not item:
-                continue
-            if item.startswith("chat:") or item.startswith("user:"):
-                item = item.split(":", 1)[1].strip()
-            if item.startswith("@"):
-                continue
-            if not item or item in {"0", "-0"}:
-                continue
-            try:
-                result.append(int(item))
-            except ValueError:
-                continue
-        seen: set[int] = set()
-        unique: list[int] = []
-        for value in result:
-            if value in seen:
-                continue
-            seen.add(value)
-            unique.append(value)
-        return tuple(unique)
+            raw_value = ",".join(str(item) for item in raw_value)
+        ids = (int(item) for item in _ADMIN_ID_RE.findall(str(raw_value)))
+        return tuple(dict.fromkeys(value for value in ids if value))
 
     @cached_property
     def admin_usernames(self) -> tuple[str, ...]:
@@ -150,14 +155,15 @@ class Settings(BaseSettings):
             if item.lstrip("-").isdigit():
                 continue
             result.append(item.lower())
-        seen: set[str] = set()
-        unique: list[str] = []
-        for value in result:
-            if value in seen:
-                continue
-            seen.add(value)
-            unique.append(value)
-        return tuple(unique)
+        return tuple(dict.fromkeys(result))
+
+    @cached_property
+    def admin_chat_id_set(self) -> frozenset[int]:
+        return frozenset(self.admin_chat_ids)
+
+    @cached_property
+    def admin_username_set(self) -> frozenset[str]:
+        return frozenset(self.admin_usernames)
 
     @property
     def admin_chat_id(self) -> int | None:
@@ -168,80 +174,49 @@ class Settings(BaseSettings):
 
     @staticmethod
     def _parse_bool(value: Any, default: bool = False) -> bool:
-        if isinstance(value, bool):
+        if value is True or value is False:
             return value
-        if value in (None, ""):
+        if value is None or value == "":
             return default
-        return str(value).strip().lower() in {"1", "true", "yes", "on"}
-
-    @field_validator("leads_upsert", mode="before")
-    @classmethod
-    def parse_leads_upsert(cls, value: Any) -> bool:
-        return cls._parse_bool(value)
-
-    @field_validator("alerts_enabled", mode="before")
-    @classmethod
-    def parse_alerts_enabled(cls, value: Any) -> bool:
-        return cls._parse_bool(value)
-
-    @field_validator("alerts_mask_phone", mode="before")
-    @classmethod
-    def parse_alerts_mask_phone(cls, value: Any) -> bool:
-        return cls._parse_bool(value, default=True)
-
-    @field_validator("qa_enabled", mode="before")
-    @classmethod
-    def parse_qa_enabled(cls, value: Any) -> bool:
-        return cls._parse_bool(value)
-
-    @field_validator("qa_fallback_to_menu", "qa_buttons_shown", mode="before")
-    @classmethod
-    def parse_qa_flags(cls, value: Any) -> bool:
-        return cls._parse_bool(value, default=True)
-
-    @field_validator("qa_rate_limit_seconds")
-    @classmethod
-    def validate_qa_rate_limit(cls, value: int) -> int:
-        return max(0, value)
+        return str(value).strip().lower() in _TRUE_VALUES
 
     @field_validator(
+        "leads_upsert",
+        "alerts_enabled",
+        "qa_enabled",
         "reminder_enabled",
         "reminder_only_if_no_lead",
         "reminder_only_if_not_used",
+        "lottery_enabled",
+        "lottery_ab_test",
         mode="before",
     )
     @classmethod
-    def parse_reminder_flags(cls, value: Any) -> bool:
-        return cls._parse_bool(value)
-
-    @field_validator("lottery_enabled", mode="before")
-    @classmethod
-    def parse_lottery_enabled(cls, value: Any) -> bool:
+    def parse_flags(cls, value: Any) -> bool:
         return cls._parse_bool(value)
 
-    @field_validator("lottery_ab_test", mode="before")
-    @classmethod
-    def parse_lottery_ab_test(cls, value: Any) -> bool:
-        return cls._parse_bool(value)
-
-    @field_validator("alerts_rate_limit")
-    @classmethod
-    def validate_alerts_rate_limit(cls, value: int) -> int:
-        return max(0, value)
-
-    @field_validator("alerts_bundle_window")
-    @classmethod
-    def validate_alerts_bundle_window(cls, value: int) -> int:
-        return max(0, value)
-
-    @field_validator("reminder_delay_hours")
+    @field_validator(
+        "alerts_mask_phone",
+        "qa_fallback_to_menu",
+        "qa_buttons_shown",
+        mode="before",
+    )
     @classmethod
-    def validate_delay(cls, value: int) -> int:
-        return max(0, value)
+    def parse_default_on_flags(cls, value: Any) -> bool:
+        return cls._parse_bool(value, default=True)
 
-    @field_validator("reminder_max_per_user")
+    @field_validator(
+        "qa_rate_limit_seconds",
+        "alerts_rate_limit",
+        "alerts_bundle_window",
+        "reminder_delay_hours",
+        "reminder_max_per_user",
+        "lottery_variants",
+        "lottery_cooldown_days",
+        "sheets_read_cache_ttl",
+    )
     @classmethod
-    def validate_max_per_user(cls, value: int) -> int:
+    def clamp_non_negative(cls, value: int) -> int:
         return max(0, value)
 
     @field_validator("reminder_work_hours", mode="before")
@@ -250,7 +225,7 @@ class Settings(BaseSettings):
         if isinstance(value, (list, tuple)) and len(value) >= 2:
             start, end = int(value[0]), int(value[1])
         elif isinstance(value, str):
-            parts = [part.strip() for part in value.replace("–", "-").split("-") if part.strip()]
+            parts = [part.strip() for part in _HOURS_SPLIT_RE.split(value) if part.strip()]
             if len(parts) != 2:
                 return (10, 20)
             start, end = int(parts[0]), int(parts[1])
@@ -264,80 +239,40 @@ class Settings(BaseSettings):
             start, end = end, start
         return (start, end)
 
-    @field_validator("lottery_variants")
-    @classmethod
-    def validate_lottery_variants(cls, value: int) -> int:
-        if value < 0:
-            return 0
-        return value
-
     @field_validator("lottery_weights", mode="before")
     @classmethod
     def parse_lottery_weights(cls, value: Any) -> list[float]:
-        if isinstance(value, (list, tuple)):
-            return [float(x) for x in value if str(x).strip() != ""]
-        if isinstance(value, str):
-            if not value.strip():
-                return []
-            parts = [part.strip() for part in value.split(",") if part.strip()]
-            return [float(part) for part in parts]
-        if value in (None, ""):
+        items = _decode_list_or_map(value)
+        if items is None:
             return []
-        return [float(value)]
+        if isinstance(items, (list, tuple)):
+            return [float(x) for x in items if str(x).strip() != ""]
+        return [float(items)]
 
     @field_validator("lottery_results", mode="before")
     @classmethod
     def parse_lottery_results(cls, value: Any) -> list[str]:
-        if isinstance(value, (list, tuple)):
-            return [str(item).strip() for item in value if str(item).strip()]
-        if isinstance(value, str):
-            if not value.strip():
-                return []
-            if value.strip().startswith("["):
-                try:
-                    parsed = json.loads(value)
-                    if isinstance(parsed, list):
-                        return [str(item).strip() for item in parsed if str(item).strip()]
-                except json.JSONDecodeError:
-                    pass
-            parts = [part.strip() for part in value.split(",")]
-            return [part for part in parts if part]
+        items = _decode_list_or_map(value)
+        if isinstance(items, (list, tuple)):
+            return [str(item).strip() for item in items if str(item).strip()]
         return []
 
     @field_validator("lottery_coupon_campaign_map", mode="before")
     @classmethod
     def parse_lottery_campaign_map(cls, value: Any) -> Dict[str, str]:
-        if isinstance(value, dict):
-            return {str(k): str(v) for k, v in value.items() if str(k).strip()}
-        if isinstance(value, str):
-            value = value.strip()
-            if not value:
-                return {}
-            try:
-                parsed = json.loads(value)
-                if isinstance(parsed, dict):
-                    return {
-                        str(k): str(v)
-                        for k, v in parsed.items()
-                        if str(k).strip()
-                    }
-            except json.JSONDecodeError:
-                pairs = [part.strip() for part in value.split(",") if part.strip()]
-                mapping: Dict[str, str] = {}
-                for pair in pairs:
-                    if ":" in pair:
-                        key, val = pair.split(":", 1)
-                        key = key.strip()
-                        val = val.strip()
-                        if key:
-                            mapping[key] = val
-                return mapping
-        return {}
-
-    @field_validator("lottery_cooldown_days")
-    @classmethod
-    def validate_lottery_cooldown(cls, value: int) -> int:
-        return max(0, value)
+        items = _decode_list_or_map(value)
+        if isinstance(items, dict):
+            return {str(k): str(v) for k, v in items.items() if str(k).strip()}
+        mapping: Dict[str, str] = {}
+        if isinstance(items, list):
+            for pair in items:
+                if not isinstance(pair, str) or ":" not in pair:
+                    continue
+                key, val = pair.split(":", 1)
+                key = key.strip()
+                if key:
+                    mapping[key] = val.strip()
+        return mapping
 
     @field_validator("draw_prefix")
     @classmethod
@@ -347,30 +282,36 @@ class Settings(BaseSettings):
 
     @cached_property
     def google_service_credentials(self) -> Dict[str, Any]:
-        decoded = base64.b64decode(self.google_service_json_b64)
-        return json.loads(decoded)
+        return _load_service_credentials(self.google_service_json_b64)
+
+
+@lru_cache(maxsize=1)
+def _load_service_credentials(encoded: str) -> Dict[str, Any]:
+    return orjson.loads(base64.b64decode(encoded))
+
+
+_settings: Settings | None = None
 
 
-@lru_cache()
 def get_settings() -> Settings:
     """Get application settings."""
-    return Settings()
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
 
 
+@lru_cache(maxsize=1024)
 def is_admin_user(user_id: int | None, username: str | None = None) -> bool:
     """Check if user is admin based on ADMIN_CHAT_ID (ID or username)."""
     settings = get_settings()
-    logging.info(
-        f"is_admin_user check: user_id={user_id}, username={username}, "
-        f"admin_ids={settings.admin_chat_ids}, admin_usernames={settings.admin_usernames}"
-    )
-    if user_id is not None and user_id in settings.admin_chat_ids:
-        logging.info(f"User {user_id} is admin by ID")
+    if user_id is not None and user_id in settings.admin_chat_id_set:
+        logger.debug("User %s is admin by ID", user_id)
         return True
     if username:
         normalized = username.lstrip("@").lower()
-        if normalized in settings.admin_usernames:
-            logging.info(f"User @{username} is admin by username")
+        if normalized in settings.admin_username_set:
+            logger.debug("User @%s is admin by username", username)
             return True
-    logging.info(f"User {user_id}/@{username} is NOT admin")
+    logger.debug("User %s/@%s is NOT admin", user_id, username)
     return False
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+from typing import Awaitable, Callable, Dict
 
 from aiogram import Dispatcher, types
 from aiogram.dispatcher import FSMContext
+from aiogram.dispatcher.filters import Text
 from aiogram.dispatcher.filters.state import State, StatesGroup
 
 from app.config import get_settings, is_admin_user
@@ -12,33 +16,38 @@ from app.utils import safe_text
 
 logger = logging.getLogger(__name__)
 
+COUPON_CODE_RE = re.compile(r"[\w-]{3,64}")
+
+_REPORT_TEMPLATE = (
+    "Отчет:\n"
+    "Событий: {events}\n"
+    "Лидов: {leads}\n"
+    "Купонов в таблице: {coupons}"
+)
+
+
 class AdminCouponStates(StatesGroup):
     waiting_code = State()
     waiting_campaign = State()
 
 
 async def cmd_ping(message: types.Message) -> None:
-    if not is_admin_user(message.from_user.id, message.from_user.username):
-        return
     await message.answer("pong")
 
 
 async def cmd_report(message: types.Message) -> None:
-    if not is_admin_user(message.from_user.id, message.from_user.username):
-        return
-    events = await sheets.read("events")
-    leads = await sheets.read("leads")
-    coupons_data = await sheets.read("coupons")
-    text = (
-        "Отчет:\n"
-        f"Событий: {len(events)}\n"
-        f"Лидов: {len(leads)}\n"
-        f"Купонов в таблице: {len(coupons_data)}"
+    events, leads, coupons_data = await asyncio.gather(
+        sheets.read_cached("events"),
+        sheets.read_cached("leads"),
+        sheets.read_cached("coupons"),
+    )
+    text = _REPORT_TEMPLATE.format(
+        events=len(events), leads=len(leads), coupons=len(coupons_data)
     )
     await message.answer(text)
 
 
-def _admin_panel_kb() -> types.InlineKeyboardMarkup:
+def _build_admin_panel_kb() -> types.InlineKeyboardMarkup:
     markup = types.InlineKeyboardMarkup(row_width=1)
     markup.add(
         types.InlineKeyboardButton(text="➕ Добавить купон", callback_data="admin_add_coupon")
@@ -49,6 +58,13 @@ def _admin_panel_kb() -> types.InlineKeyboardMarkup:
     return markup
 
 
+_ADMIN_PANEL_KB = _build_admin_panel_kb()
+
+
+def _admin_panel_kb() -> types.InlineKeyboardMarkup:
+    return _ADMIN_PANEL_KB
+
+
 async def cmd_admin(message: types.Message, state: FSMContext) -> None:
     logger.info(f"cmd_admin called: user_id={message.from_user.id}, username={message.from_user.username}")
     if not is_admin_user(message.from_user.id, message.from_user.username):
@@ -60,25 +76,31 @@ async def cmd_admin(message: types.Message, state: FSMContext) -> None:
 
 
 async def cmd_cancel(message: types.Message, state: FSMContext) -> None:
-    if not is_admin_user(message.from_user.id, message.from_user.username):
-        return
     await state.finish()
     await message.answer("Действие отменено.", reply_markup=_admin_panel_kb())
 
 
-async def callback_admin_report(call: types.CallbackQuery) -> None:
-    if not is_admin_user(call.from_user.id, call.from_user.username):
-        await call.answer()
+_ADMIN_COMMANDS: Dict[str, Callable[[types.Message, FSMContext], Awaitable[None]]] = {
+    "admin": cmd_admin,
+    "cancel": cmd_cancel,
+    "ping": lambda message, _state: cmd_ping(message),
+    "report": lambda message, _state: cmd_report(message),
+}
+
+
+async def admin_command(message: types.Message, state: FSMContext) -> None:
+    if not is_admin_user(message.from_user.id, message.from_user.username):
         return
-    await call.answer()
+    handler = _ADMIN_COMMANDS.get((message.get_command(pure=True) or "").lower())
+    if handler:
+        await handler(message, state)
+
+
+async def callback_admin_report(call: types.CallbackQuery, state: FSMContext) -> None:
     await cmd_report(call.message)
 
 
 async def callback_admin_add_coupon(call: types.CallbackQuery, state: FSMContext) -> None:
-    if not is_admin_user(call.from_user.id, call.from_user.username):
-        await call.answer()
-        return
-    await call.answer()
     await state.finish()
     await AdminCouponStates.waiting_code.set()
     await call.message.answer(
@@ -86,6 +108,21 @@ async def callback_admin_add_coupon(call: types.CallbackQuery, state: FSMContext
     )
 
 
+_ADMIN_CALLBACKS: Dict[str, Callable[[types.CallbackQuery, FSMContext], Awaitable[None]]] = {
+    "admin_report": callback_admin_report,
+    "admin_add_coupon": callback_admin_add_coupon,
+}
+
+
+async def admin_callback(call: types.CallbackQuery, state: FSMContext) -> None:
+    await call.answer()
+    if not is_admin_user(call.from_user.id, call.from_user.username):
+        return
+    handler = _ADMIN_CALLBACKS.get(call.data)
+    if handler:
+        await handler(call, state)
+
+
 async def message_admin_coupon_code(message: types.Message, state: FSMContext) -> None:
     if not is_admin_user(message.from_user.id, message.from_user.username):
         return
@@ -96,6 +133,11 @@ async def message_admin_coupon_code(message: types.Message, state: FSMContext) -
     if not code:
         await message.answer("Код не распознан. Попробуйте ещё раз.")
         return
+    if not COUPON_CODE_RE.fullmatch(code):
+        await message.answer(
+            "Код может содержать буквы, цифры, «_» и «-» (от 3 до 64 символов). Попробуйте ещё раз."
+        )
+        return
     await state.update_data(code=code)
     await AdminCouponStates.waiting_campaign.set()
     await message.answer(
@@ -114,7 +156,7 @@ async def message_admin_coupon_campaign(message: types.Message, state: FSMContex
     if raw in {"-", "—", "нет", "без", "none"}:
         campaign = ""
     data = await state.get_data()
-    code = safe_text(data.get("code")) if isinstance(data, dict) else ""
+    code = safe_text(data.get("code"))
     if not code:
         await state.finish()
         await message.answer("Не удалось получить код. Попробуйте снова.", reply_markup=_admin_panel_kb())
@@ -136,13 +178,9 @@ async def message_admin_coupon_campaign(message: types.Message, state: FSMContex
 
 
 def register(dp: Dispatcher) -> None:
-    dp.register_message_handler(cmd_ping, commands=["ping"], state="*")
-    dp.register_message_handler(cmd_report, commands=["report"], state="*")
-    dp.register_message_handler(cmd_admin, commands=["admin"], state="*")
-    dp.register_message_handler(cmd_admin, lambda message: message.text == "Админ-панель", state="*")
-    dp.register_message_handler(cmd_cancel, commands=["cancel"], state="*")
-    dp.register_callback_query_handler(callback_admin_report, lambda c: c.data == "admin_report", state="*")
-    dp.register_callback_query_handler(callback_admin_add_coupon, lambda c: c.data == "admin_add_coupon", state="*")
+    dp.register_message_handler(admin_command, commands=list(_ADMIN_COMMANDS), state="*")
+    dp.register_message_handler(cmd_admin, Text(equals="Админ-панель"), state="*")
+    dp.register_callback_query_handler(admin_callback, Text(equals=list(_ADMIN_CALLBACKS)), state="*")
     dp.register_message_handler(
         message_admin_coupon_code,
         state=AdminCouponStates.waiting_code,
@@ -1,41 +1,78 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import logging
 
-from aiogram import Dispatcher, types
+from aiogram import Bot, Dispatcher, types
 from aiogram.dispatcher import FSMContext
 
 from app.config import get_settings, is_admin_user
 from app.handlers import intensive as intensive_handlers
-from app.keyboards.common import kb_main_menu, kb_send_contact
-from app.services import alerts, phone, reminders, sheets, stats
+from app.keyboards.common import is_cancel_text, kb_main_menu, kb_send_contact
+from app.keyboards.intensive import is_lead_reply_text
+from app.services import alerts, lead_index, phone, reminders, sheets, sheets_writer, stats
 from app.storage import db
+from app.utils import normalize_username, spawn
 
 logger = logging.getLogger(__name__)
 
 
-async def handle_contact(message: types.Message, state: FSMContext) -> None:
-    if message.text and message.text.startswith("/"):
-        return
+def _may_be_lead_reply(message: types.Message) -> bool:
+    """Filter for text that could answer the phone prompt, checked before any state read."""
+    return is_lead_reply_text(message.text)
+
+
+async def _record_lead(
+    bot: Bot,
+    *,
+    user_id: int,
+    username: str,
+    phone_number: str,
+    campaign: str,
+    created_at: dt.datetime,
+) -> None:
+    results = await asyncio.gather(
+        stats.log_event(
+            user_id,
+            campaign,
+            "lead",
+            {"user_id": user_id, "campaign": campaign, "username": username},
+        ),
+        db.upsert_lead(user_id, campaign),
+        reminders.cancel_due_to_lead(user_id, campaign),
+        alerts.notify_new_lead(
+            bot,
+            user_id=user_id,
+            username=username or None,
+            phone=phone_number,
+            campaign=campaign,
+            created_at=created_at,
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error("Failed to record lead for user %s", user_id, exc_info=result)
 
+
+async def handle_contact(message: types.Message, state: FSMContext) -> None:
     data = await state.get_data()
     lead_context = data.get("lead_context")
     if not lead_context:
         return
 
     flow = str(lead_context.get("flow") or "default").lower()
-    campaign = str(lead_context.get("campaign") or data.get("campaign") or "default")
-
     if flow == "intensive":
         await intensive_handlers.process_lead_message(message, state, lead_context)
         return
 
-    if message.text and message.text.lower() == "отмена":
-        await message.answer("Отменено.", reply_markup=types.ReplyKeyboardRemove())
+    campaign = str(lead_context.get("campaign") or data.get("campaign") or "default")
+
+    if is_cancel_text(message.text):
         await state.update_data(lead_context=None)
         await message.answer(
-            "Хорошо, действия доступны на клавиатуре ниже.",
+            "Отменено. Действия доступны на клавиатуре ниже.",
             reply_markup=kb_main_menu(message.from_user.id, message.from_user.username),
         )
         return
@@ -60,10 +97,7 @@ async def handle_contact(message: types.Message, state: FSMContext) -> None:
         )
         return
 
-    raw_username = message.from_user.username or ""
-    normalized_username = ""
-    if raw_username:
-        normalized_username = f"@{raw_username.lstrip('@').lower()}"
+    normalized_username = normalize_username(message.from_user.username)
 
     timestamp = sheets.current_timestamp()
     created_at = timestamp.moment
@@ -80,71 +114,49 @@ async def handle_contact(message: types.Message, state: FSMContext) -> None:
     settings = get_settings()
 
     if settings.leads_upsert:
-        leads = await sheets.read("leads")
-        existing = next(
-            (
-                item
-                for item in leads
-                if str(item.get("user_id")) == str(message.from_user.id)
-                and str(item.get("campaign") or "default") == campaign
-            ),
-            None,
+        update = {
+            "phone": normalized_phone,
+            "username": normalized_username,
+            "updated_at": timestamp.utc_text,
+        }
+        updated = await lead_index.update_lead(
+            message.from_user.id, campaign, normalized_phone, update
         )
-        if existing:
-            await sheets.update_row(
-                "leads",
-                existing["row"],
-                {
-                    "phone": normalized_phone,
-                    "username": normalized_username,
-                    "updated_at": dt.datetime.utcnow().isoformat(),
-                },
+        if not updated and campaign == "default":
+            updated = await lead_index.update_lead(
+                message.from_user.id, "", normalized_phone, update
             )
-        else:
-            await sheets.append(
-                "leads",
-                lead_payload,
-                optional_headers=["created_at_msk"],
-                meta=timestamp.meta,
+        if not updated:
+            row = await sheets_writer.enqueue(
+                "leads", lead_payload, optional_headers=["created_at_msk"]
             )
+            lead_index.remember(message.from_user.id, campaign, row, normalized_phone)
     else:
-        await sheets.append(
-            "leads",
-            lead_payload,
-            optional_headers=["created_at_msk"],
-            meta=timestamp.meta,
+        await sheets_writer.enqueue(
+            "leads", lead_payload, optional_headers=["created_at_msk"]
         )
 
-    await stats.log_event(
-        message.from_user.id,
-        campaign,
-        "lead",
-        {
-            "user_id": message.from_user.id,
-            "campaign": campaign,
-            "username": normalized_username,
-        },
-    )
-    await db.upsert_lead(message.from_user.id, campaign)
-    await reminders.cancel_due_to_lead(message.from_user.id, campaign)
-    await message.answer(
-        "Спасибо! Мы свяжемся с вами в ближайшее время.",
-        reply_markup=types.ReplyKeyboardRemove(),
-    )
     await message.answer(
+        "Спасибо! Мы свяжемся с вами в ближайшее время.\n"
         "Если понадобится, воспользуйтесь клавиатурой ниже.",
         reply_markup=kb_main_menu(message.from_user.id, message.from_user.username),
     )
-    await alerts.notify_new_lead(
-        message.bot,
-        user_id=message.from_user.id,
-        username=normalized_username or None,
-        phone=normalized_phone,
-        campaign=campaign,
-        created_at=created_at,
-    )
     await state.update_data(lead_context=None)
+    spawn(
+        _record_lead(
+            message.bot,
+            user_id=message.from_user.id,
+            username=normalized_username,
+            phone_number=normalized_phone,
+            campaign=campaign,
+            created_at=created_at,
+        ),
+        name="record_lead",
+    )
 
 
 def register(dp: Dispatcher) -> None:
-    dp.register_message_handler(handle_contact, content_types=["contact", "text"], state="*")
+    dp.register_message_handler(handle_contact, content_types=["contact"], state="*")
+    dp.register_message_handler(
+        handle_contact, _may_be_lead_reply, content_types=["text"], state="*"
+    )
@@ -9,18 +9,19 @@ from app.keyboards.common import kb_get_gift
 from app.services import stats
 from app.services.deep_link import parse_start_payload
 
-FORTUNES = [
+FORTUNES = (
     "Сегодня вас ждет полезный инсайт на вебинаре!",
     "Наставник уже готов поделиться секретами успеха.",
     "Вы встретите людей, которые помогут в развитии.",
     "Ваш проект сделает рывок благодаря новым знаниям.",
-]
+)
+_RNG = random.Random()
 
 
 async def cmd_fortune(message: types.Message, state: FSMContext) -> None:
     campaign = parse_start_payload(message.text)
     await state.update_data(campaign=campaign)
-    fortune = random.choice(FORTUNES)
+    fortune = FORTUNES[_RNG.randrange(len(FORTUNES))]
     username = message.from_user.username if message.from_user else None
     await stats.log_event(
         message.from_user.id,
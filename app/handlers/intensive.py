@@ -1,24 +1,41 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import logging
+import re
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Awaitable, Callable, Dict, Optional
 
 from aiogram import Bot, Dispatcher, types
 from aiogram.dispatcher import FSMContext
+from aiogram.dispatcher.filters import Text
+from aiogram.dispatcher.handler import SkipHandler
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.keyboards.common import is_cancel_text
 from app.keyboards.intensive import (
+    MANUAL_PHONE_FOLDED,
+    is_lead_reply_text,
     kb_request_phone,
     qa_answer_keyboard,
     qa_menu_keyboard,
 )
-from app.services import alerts, phone, sheets, stats, sub_check
+from app.services import (
+    alerts,
+    lead_index,
+    media,
+    phone,
+    sheets,
+    sheets_writer,
+    stats,
+    sub_check,
+)
 from app.storage import db
-from app.utils import safe_text
+from app.utils import normalize_username, safe_text, spawn
 
 logger = logging.getLogger(__name__)
 
@@ -115,40 +132,79 @@ TOPIC_BY_KEY: Dict[str, QATopic] = {topic.key: topic for topic in TOPICS}
 
 MEDIA_DIR = Path(__file__).resolve().parents[2]
 
+WELCOME_PHOTO = MEDIA_DIR / "5445306490634833224_121.jpg"
 TOPIC_PHOTOS: Dict[str, Path] = {}
+# Media ships with the app, so existence is checked once instead of per message.
+_WELCOME_PHOTO_FILE: Optional[str] = str(WELCOME_PHOTO) if WELCOME_PHOTO.exists() else None
+_TOPIC_PHOTO_FILES: Dict[str, str] = {
+    key: str(path) for key, path in TOPIC_PHOTOS.items() if path.exists()
+}
+
+
+_BACK_WORDS = frozenset(("назад", "меню"))
+
+# Users whose intensive state was written on this process (see
+# _save_intensive). /start keeps that state, so entries are only dropped once
+# qa_text_handler finds it gone, e.g. after an admin command reset the FSM.
+_active_users: set[int] = set()
+
+_TOPICS_FOR_KEYBOARD: tuple[tuple[str, str], ...] = tuple(
+    (topic.key, topic.button) for topic in TOPICS
+)
 
 
-def _topics_for_keyboard() -> list[tuple[str, str]]:
-    return [(topic.key, topic.button) for topic in TOPICS]
+# Markups are never mutated after construction, so one per campaign is shared.
+@lru_cache(maxsize=64)
+def _menu_markup(campaign: str) -> types.InlineKeyboardMarkup:
+    return qa_menu_keyboard(campaign, _TOPICS_FOR_KEYBOARD)
 
 
-def _match_topic(text: str) -> Optional[QATopic]:
-    normalized = safe_text(text).lower()
+def _build_keyword_re(topics: tuple[QATopic, ...]) -> re.Pattern[str]:
+    # One group per topic in priority order; the lookahead reports overlapping
+    # hits at every offset so no keyword is shadowed by a neighbouring one.
+    groups = "|".join(
+        "({})".format("|".join(re.escape(keyword) for keyword in topic.keywords))
+        for topic in topics
+    )
+    return re.compile(f"(?=(?:{groups}))")
+
+
+_KEYWORD_RE = _build_keyword_re(TOPICS)
+_TOPIC_BY_BUTTON: Dict[str, QATopic] = {topic.button.lower(): topic for topic in TOPICS}
+
+
+def _normalize_text(text: str) -> str:
+    # Callers pass message.text after checking it is a non-empty str.
+    return text.strip().lower()
+
+
+def _match_topic(normalized: str) -> Optional[QATopic]:
+    """Find the topic for text already passed through ``_normalize_text``."""
     if not normalized:
         return None
-    for topic in TOPICS:
-        if topic.button.lower() == normalized:
-            return topic
-        for keyword in topic.keywords:
-            if keyword in normalized:
-                return topic
-    return None
+    # A pressed button always maps to its own topic, even when its label
+    # contains a keyword of an earlier topic ("... интенсива").
+    topic = _TOPIC_BY_BUTTON.get(normalized)
+    if topic is not None:
+        return topic
+    best = len(TOPICS)
+    for match in _KEYWORD_RE.finditer(normalized):
+        index = match.lastindex - 1
+        if index < best:
+            best = index
+            if best == 0:
+                break
+    return TOPICS[best] if best < len(TOPICS) else None
 
 
 async def cmd_intensive(message: types.Message, state: FSMContext) -> None:
     args = safe_text(message.get_args()) or "default"
     campaign = args or "default"
-    await state.update_data(campaign=campaign)
-    intensive_state = {
-        "campaign": campaign,
-        "sub_ok": False,
-        "qa_last_response": 0.0,
-    }
-    await state.update_data(intensive=intensive_state)
+    intensive_state = IntensiveState(campaign=campaign)
 
     settings = get_settings()
     menu_markup = (
-        qa_menu_keyboard(campaign, _topics_for_keyboard())
+        _menu_markup(campaign)
         if settings.qa_buttons_shown
         else None
     )
@@ -160,23 +216,28 @@ async def cmd_intensive(message: types.Message, state: FSMContext) -> None:
         "навыки и эффективность процессов.\n\n"
         "Что рассказать про интенсив? Выберите тему или задайте вопрос."
     )
-    welcome_photo = MEDIA_DIR / "5445306490634833224_121.jpg"
-    if welcome_photo.exists():
-        await message.answer_photo(
-            types.InputFile(str(welcome_photo)),
+    if _WELCOME_PHOTO_FILE:
+        send_welcome = media.answer_photo(
+            message,
+            _WELCOME_PHOTO_FILE,
             caption=welcome_text,
             reply_markup=menu_markup,
         )
     else:
-        await message.answer(welcome_text, reply_markup=menu_markup)
+        send_welcome = message.answer(welcome_text, reply_markup=menu_markup)
+
+    # The membership lookup does not depend on the welcome message.
+    _, is_member = await asyncio.gather(
+        send_welcome, sub_check.is_member(message.bot, message.from_user.id)
+    )
+    if is_member:
+        intensive_state.sub_ok = True
+        intensive_state.sub_confirmed_at = time.time()
+    await _save_intensive(state, message.from_user.id, intensive_state, campaign=campaign)
 
-    is_member = await sub_check.is_member(message.bot, message.from_user.id)
     if is_member:
-        intensive_state["sub_ok"] = True
-        intensive_state["sub_confirmed_at"] = time.time()
-        await state.update_data(intensive=intensive_state)
         if settings.qa_enabled:
-            await stats.log_event(
+            stats.log_event_nowait(
                 message.from_user.id,
                 campaign,
                 "qa_entry",
@@ -187,6 +248,22 @@ async def cmd_intensive(message: types.Message, state: FSMContext) -> None:
         await _prompt_check_subscription(message.chat.id, campaign, message.bot)
 
 
+def _parse_callback_data(
+    data: str | None, *, with_topic: bool = False
+) -> tuple[str, str, str]:
+    """Split ``prefix:campaign`` (``prefix:campaign:topic`` with ``with_topic``) callback data.
+
+    The campaign is everything between the prefix and the topic, so a
+    campaign containing ":" stays whole. Missing parts default to the
+    "default" campaign and the "about" topic.
+    """
+    prefix, _, campaign = (data or "").partition(":")
+    topic_key = ""
+    if with_topic and ":" in campaign:
+        campaign, _, topic_key = campaign.rpartition(":")
+    return prefix, safe_text(campaign) or "default", safe_text(topic_key) or "about"
+
+
 async def _prompt_check_subscription(chat_id: int, campaign: str, bot: Bot) -> None:
     markup = types.InlineKeyboardMarkup(row_width=1)
     markup.add(
@@ -205,20 +282,17 @@ async def _prompt_check_subscription(chat_id: int, campaign: str, bot: Bot) -> N
 
 async def callback_check_sub(call: types.CallbackQuery, state: FSMContext) -> None:
     await call.answer()
-    campaign = "default"
-    if call.data and ":" in call.data:
-        campaign = safe_text(call.data.split(":", 1)[1]) or "default"
-    await state.update_data(campaign=campaign)
+    _, campaign, _ = _parse_callback_data(call.data)
     is_member = await sub_check.is_member(call.bot, call.from_user.id)
     data = await state.get_data()
-    intensive_state = data.get("intensive") or {"campaign": campaign}
-    intensive_state["campaign"] = campaign
+    intensive_state = _get_intensive_state(data) or IntensiveState()
+    intensive_state.campaign = campaign
     username = safe_text(call.from_user.username) or None
     if is_member:
-        intensive_state["sub_ok"] = True
-        intensive_state["sub_confirmed_at"] = time.time()
-        await state.update_data(intensive=intensive_state)
-        await stats.log_event(
+        intensive_state.sub_ok = True
+        intensive_state.sub_confirmed_at = time.time()
+        await _save_intensive(state, call.from_user.id, intensive_state, campaign=campaign)
+        stats.log_event_nowait(
             call.from_user.id,
             campaign,
             "sub_ok",
@@ -228,24 +302,31 @@ async def callback_check_sub(call: types.CallbackQuery, state: FSMContext) -> No
         await call.message.answer("Спасибо! Вы в списке канала 👌")
         await _show_menu(call.message, campaign, source="menu_button")
     else:
-        intensive_state["sub_ok"] = False
-        await state.update_data(intensive=intensive_state)
+        intensive_state.sub_ok = False
+        await _save_intensive(state, call.from_user.id, intensive_state, campaign=campaign)
         await call.message.answer(
             "Похоже, подписка ещё не оформлена. Подписывайтесь и жмите кнопку снова."
         )
 
 
-async def _show_menu(message: types.Message, campaign: str, *, source: str) -> None:
-    settings = get_settings()
+async def _show_menu(
+    message: types.Message,
+    campaign: str,
+    *,
+    source: str,
+    settings: Settings | None = None,
+) -> None:
+    if settings is None:
+        settings = get_settings()
     username = safe_text(message.from_user.username) or None
     if settings.qa_buttons_shown:
-        keyboard = qa_menu_keyboard(campaign, _topics_for_keyboard())
+        keyboard = _menu_markup(campaign)
     else:
         keyboard = None
     text = "Что рассказать про интенсив? Выберите тему или задайте вопрос."
     await message.answer(text, reply_markup=keyboard)
     if settings.qa_enabled:
-        await stats.log_event(
+        stats.log_event_nowait(
             message.from_user.id,
             campaign,
             "qa_entry",
@@ -254,44 +335,72 @@ async def _show_menu(message: types.Message, campaign: str, *, source: str) -> N
         )
 
 
-def _get_intensive_state(data: Dict[str, object]) -> Dict[str, object]:
-    state = data.get("intensive")
-    if isinstance(state, dict):
-        return state
-    return {}
+@dataclass(slots=True)
+class IntensiveState:
+    """Working copy of the ``intensive`` FSM entry, which is stored as a plain dict."""
+
+    campaign: str = "default"
+    sub_ok: bool = False
+    sub_confirmed_at: float = 0.0
+    qa_last_response: float = 0.0
+    last_topic: Optional[str] = None
+
+    @classmethod
+    def from_data(cls, value: object) -> Optional[IntensiveState]:
+        if not isinstance(value, dict) or not value:
+            return None
+        return cls(
+            campaign=safe_text(value.get("campaign")) or "default",
+            sub_ok=bool(value.get("sub_ok")),
+            sub_confirmed_at=float(value.get("sub_confirmed_at") or 0.0),
+            qa_last_response=float(value.get("qa_last_response") or 0.0),
+            last_topic=safe_text(value.get("last_topic")) or None,
+        )
+
+    def to_data(self) -> Dict[str, object]:
+        return {
+            "campaign": self.campaign,
+            "sub_ok": self.sub_ok,
+            "sub_confirmed_at": self.sub_confirmed_at,
+            "qa_last_response": self.qa_last_response,
+            "last_topic": self.last_topic,
+        }
+
+
+def _get_intensive_state(data: Dict[str, object]) -> Optional[IntensiveState]:
+    return IntensiveState.from_data(data.get("intensive"))
 
 
-def _rate_limit_ok(state: Dict[str, object]) -> bool:
-    settings = get_settings()
-    cooldown = settings.qa_rate_limit_seconds
+async def _save_intensive(
+    state: FSMContext, user_id: int, intensive_state: IntensiveState, **updates: object
+) -> None:
+    """Store ``intensive_state`` (plus ``updates``) and route the user's text to QA."""
+    await state.update_data(intensive=intensive_state.to_data(), **updates)
+    _active_users.add(user_id)
+
+
+def _rate_limit_ok(state: IntensiveState, now: float, cooldown: float) -> bool:
     if cooldown <= 0:
         return True
-    last = float(state.get("qa_last_response") or 0.0)
-    now = time.time()
-    return now - last >= cooldown
+    return now - state.qa_last_response >= cooldown
 
 
 async def callback_topic(call: types.CallbackQuery, state: FSMContext) -> None:
     await call.answer()
+    now = time.time()
     settings = get_settings()
     if not settings.qa_enabled:
         return
-    campaign = "default"
-    topic_key = "about"
-    if call.data:
-        parts = call.data.split(":", 2)
-        if len(parts) >= 3:
-            campaign = safe_text(parts[1]) or "default"
-            topic_key = safe_text(parts[2]) or "about"
+    _, campaign, topic_key = _parse_callback_data(call.data, with_topic=True)
     data = await state.get_data()
-    intensive_state = _get_intensive_state(data)
-    if not _rate_limit_ok(intensive_state):
+    intensive_state = _get_intensive_state(data) or IntensiveState()
+    if not _rate_limit_ok(intensive_state, now, settings.qa_rate_limit_seconds):
         return
     topic = TOPIC_BY_KEY.get(topic_key)
     if not topic:
         return
     username = safe_text(call.from_user.username) or None
-    await stats.log_event(
+    stats.log_event_nowait(
         call.from_user.id,
         campaign,
         "qa_question",
@@ -299,9 +408,8 @@ async def callback_topic(call: types.CallbackQuery, state: FSMContext) -> None:
         username=username,
     )
     if topic.key == "lead":
-        intensive_state["last_topic"] = topic.key
-        await state.update_data(intensive=intensive_state)
-        await stats.log_event(
+        intensive_state.last_topic = topic.key
+        stats.log_event_nowait(
             call.from_user.id,
             campaign,
             "qa_clicked_cta",
@@ -309,15 +417,21 @@ async def callback_topic(call: types.CallbackQuery, state: FSMContext) -> None:
             username=username,
         )
         await _start_lead_flow(
-            call.message, state, campaign, call.from_user, source="menu_button"
+            call.message,
+            state,
+            campaign,
+            call.from_user,
+            intensive_state,
+            source="menu_button",
+            save_intensive=True,
         )
         return
 
     await _send_topic_answer(call.message, topic, campaign)
-    intensive_state["qa_last_response"] = time.time()
-    intensive_state["last_topic"] = topic.key
-    await state.update_data(intensive=intensive_state)
-    await stats.log_event(
+    intensive_state.qa_last_response = now
+    intensive_state.last_topic = topic.key
+    await _save_intensive(state, call.from_user.id, intensive_state)
+    stats.log_event_nowait(
         call.from_user.id,
         campaign,
         "qa_answered",
@@ -330,11 +444,8 @@ def _answer_with_cta(text: str) -> str:
     return f"{text}\n\nГотовы присоединиться? Жмите «📝 Записаться»."
 
 
-def _photo_for_topic(topic_key: str) -> Optional[Path]:
-    path = TOPIC_PHOTOS.get(topic_key)
-    if path and path.exists():
-        return path
-    return None
+def _photo_for_topic(topic_key: str) -> Optional[str]:
+    return _TOPIC_PHOTO_FILES.get(topic_key)
 
 
 async def _send_topic_answer(
@@ -344,8 +455,9 @@ async def _send_topic_answer(
     photo_path = _photo_for_topic(topic.key)
     text = _answer_with_cta(topic.answer)
     if photo_path:
-        await message.answer_photo(
-            types.InputFile(str(photo_path)),
+        await media.answer_photo(
+            message,
+            photo_path,
             caption=text,
             reply_markup=reply_markup,
         )
@@ -355,39 +467,48 @@ async def _send_topic_answer(
 
 async def callback_menu(call: types.CallbackQuery, state: FSMContext) -> None:
     await call.answer()
-    campaign = "default"
-    if call.data and ":" in call.data:
-        campaign = safe_text(call.data.split(":", 1)[1]) or "default"
+    _, campaign, _ = _parse_callback_data(call.data)
     await _show_menu(call.message, campaign, source="back_button")
     data = await state.get_data()
-    intensive_state = _get_intensive_state(data)
-    intensive_state["qa_last_response"] = time.time()
-    intensive_state["last_topic"] = None
-    await state.update_data(intensive=intensive_state)
+    intensive_state = _get_intensive_state(data) or IntensiveState()
+    intensive_state.qa_last_response = time.time()
+    intensive_state.last_topic = None
+    await _save_intensive(state, call.from_user.id, intensive_state)
+
+
+def _has_intensive_session(message: types.Message) -> bool:
+    return message.from_user is not None and message.from_user.id in _active_users
 
 
 async def qa_text_handler(message: types.Message, state: FSMContext) -> None:
     if not message.text or message.text.startswith("/"):
         return
+    now = time.time()
     data = await state.get_data()
     intensive_state = _get_intensive_state(data)
-    if not intensive_state:
-        return
-    campaign = safe_text(intensive_state.get("campaign")) or "default"
+    if intensive_state is None:
+        # The FSM data was reset (e.g. by an admin command); let other handlers see the text.
+        _active_users.discard(message.from_user.id)
+        raise SkipHandler()
+    if data.get("lead_context") and is_lead_reply_text(message.text):
+        # The answer to a pending phone prompt belongs to the contacts handler.
+        raise SkipHandler()
+    campaign = intensive_state.campaign
     settings = get_settings()
     username = safe_text(message.from_user.username) or None
 
-    if message.text.lower() in {"назад", "меню"}:
-        await _show_menu(message, campaign, source="text_back")
-        intensive_state["qa_last_response"] = time.time()
-        await state.update_data(intensive=intensive_state)
+    normalized = _normalize_text(message.text)
+    if normalized in _BACK_WORDS:
+        await _show_menu(message, campaign, source="text_back", settings=settings)
+        intensive_state.qa_last_response = now
+        await _save_intensive(state, message.from_user.id, intensive_state)
         return
 
-    topic = _match_topic(message.text) if settings.qa_enabled else None
+    topic = _match_topic(normalized) if settings.qa_enabled else None
     if topic:
-        if not _rate_limit_ok(intensive_state):
+        if not _rate_limit_ok(intensive_state, now, settings.qa_rate_limit_seconds):
             return
-        await stats.log_event(
+        stats.log_event_nowait(
             message.from_user.id,
             campaign,
             "qa_question",
@@ -399,9 +520,8 @@ async def qa_text_handler(message: types.Message, state: FSMContext) -> None:
             username=username,
         )
         if topic.key == "lead":
-            intensive_state["last_topic"] = topic.key
-            await state.update_data(intensive=intensive_state)
-            await stats.log_event(
+            intensive_state.last_topic = topic.key
+            stats.log_event_nowait(
                 message.from_user.id,
                 campaign,
                 "qa_clicked_cta",
@@ -413,14 +533,16 @@ async def qa_text_handler(message: types.Message, state: FSMContext) -> None:
                 state,
                 campaign,
                 message.from_user,
+                intensive_state,
                 source="text_intent",
+                save_intensive=True,
             )
             return
         await _send_topic_answer(message, topic, campaign)
-        intensive_state["qa_last_response"] = time.time()
-        intensive_state["last_topic"] = topic.key
-        await state.update_data(intensive=intensive_state)
-        await stats.log_event(
+        intensive_state.qa_last_response = now
+        intensive_state.last_topic = topic.key
+        await _save_intensive(state, message.from_user.id, intensive_state)
+        stats.log_event_nowait(
             message.from_user.id,
             campaign,
             "qa_answered",
@@ -429,21 +551,21 @@ async def qa_text_handler(message: types.Message, state: FSMContext) -> None:
         )
         return
 
-    await stats.log_event(
+    stats.log_event_nowait(
         message.from_user.id,
         campaign,
         "qa_unknown",
         {"raw_text": message.text},
         username=username,
     )
-    intensive_state["qa_last_response"] = time.time()
-    intensive_state["last_topic"] = None
-    await state.update_data(intensive=intensive_state)
+    intensive_state.qa_last_response = now
+    intensive_state.last_topic = None
+    await _save_intensive(state, message.from_user.id, intensive_state)
     if settings.qa_fallback_to_menu:
         if settings.qa_buttons_shown:
             await message.answer(
                 settings.qa_unknown_answer,
-                reply_markup=qa_menu_keyboard(campaign, _topics_for_keyboard()),
+                reply_markup=_menu_markup(campaign),
             )
         else:
             await message.answer(settings.qa_unknown_answer)
@@ -456,13 +578,11 @@ async def qa_text_handler(message: types.Message, state: FSMContext) -> None:
 
 async def callback_lead(call: types.CallbackQuery, state: FSMContext) -> None:
     await call.answer()
-    campaign = "default"
-    if call.data and ":" in call.data:
-        campaign = safe_text(call.data.split(":", 1)[1]) or "default"
+    _, campaign, _ = _parse_callback_data(call.data)
     data = await state.get_data()
-    intensive_state = _get_intensive_state(data)
-    last_topic = safe_text(intensive_state.get("last_topic")) or None
-    await stats.log_event(
+    intensive_state = _get_intensive_state(data) or IntensiveState()
+    last_topic = intensive_state.last_topic
+    stats.log_event_nowait(
         call.from_user.id,
         campaign,
         "qa_clicked_cta",
@@ -470,21 +590,42 @@ async def callback_lead(call: types.CallbackQuery, state: FSMContext) -> None:
         username=safe_text(call.from_user.username) or None,
     )
     await _start_lead_flow(
-        call.message, state, campaign, call.from_user, source="cta_button"
+        call.message, state, campaign, call.from_user, intensive_state, source="cta_button"
     )
 
 
+def _iso_to_epoch(value: object) -> Optional[float]:
+    """Epoch seconds for a stored ISO timestamp; naive values are UTC."""
+    if not value:
+        return None
+    try:
+        moment = dt.datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return moment.timestamp()
+
+
 async def _start_lead_flow(
     message: types.Message,
     state: FSMContext,
     campaign: str,
     user: types.User,
+    intensive_state: IntensiveState,
     *,
     source: str,
+    save_intensive: bool = False,
 ) -> None:
-    data = await state.get_data()
-    intensive_state = _get_intensive_state(data)
-    if not intensive_state.get("sub_ok"):
+    """Ask for a phone number; ``save_intensive`` folds the caller's state write into ours."""
+    updates: Dict[str, object] = {}
+    if save_intensive:
+        updates["intensive"] = intensive_state.to_data()
+        _active_users.add(user.id)
+
+    if not intensive_state.sub_ok:
+        if updates:
+            await state.update_data(**updates)
         await message.answer(
             "Сначала подтвердите подписку через кнопку «Проверить подписку»."
         )
@@ -492,33 +633,32 @@ async def _start_lead_flow(
 
     existing = await db.get_lead(user.id, campaign)
     if existing:
-        created_at = existing.get("created_at")
-        if created_at:
-            try:
-                dt_created = dt.datetime.fromisoformat(created_at)
-            except ValueError:
-                dt_created = None
-            if dt_created and (
-                dt.datetime.utcnow() - dt_created
-            ).total_seconds() < LEAD_DUPLICATE_WINDOW_SECONDS:
-                await message.answer("Заявка уже принята 👍")
-                await stats.log_event(
-                    user.id,
-                    campaign,
-                    "lead_duplicate",
-                    {"window_seconds": LEAD_DUPLICATE_WINDOW_SECONDS},
-                    username=safe_text(user.username) or None,
-                )
-                return
+        created_at_epoch = existing.get("created_at_epoch")
+        if created_at_epoch is None:
+            created_at_epoch = _iso_to_epoch(existing.get("created_at"))
+        if (
+            created_at_epoch is not None
+            and time.time() - created_at_epoch < LEAD_DUPLICATE_WINDOW_SECONDS
+        ):
+            if updates:
+                await state.update_data(**updates)
+            await message.answer("Заявка уже принята 👍")
+            stats.log_event_nowait(
+                user.id,
+                campaign,
+                "lead_duplicate",
+                {"window_seconds": LEAD_DUPLICATE_WINDOW_SECONDS},
+                username=safe_text(user.username) or None,
+            )
+            return
 
-    await state.update_data(
-        lead_context={
-            "flow": "intensive",
-            "campaign": campaign,
-            "started_at": dt.datetime.utcnow().isoformat(),
-        }
-    )
-    await stats.log_event(
+    updates["lead_context"] = {
+        "flow": "intensive",
+        "campaign": campaign,
+        "started_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+    }
+    await state.update_data(**updates)
+    stats.log_event_nowait(
         user.id,
         campaign,
         "lead_init",
@@ -526,24 +666,24 @@ async def _start_lead_flow(
         username=safe_text(user.username) or None,
     )
     await message.answer(
-        "Оставьте номер — свяжемся, уточним даты и пришлём ссылку на оплату.",
+        "Оставьте номер — свяжемся, уточним даты и пришлём ссылку на оплату.\n\n"
+        "Можно отправить контактом или написать +7XXXXXXXXXX.",
         reply_markup=kb_request_phone(),
     )
-    await message.answer("Можно отправить контактом или написать +7XXXXXXXXXX.")
 
 
 async def process_lead_message(
     message: types.Message, state: FSMContext, context: Dict[str, object]
 ) -> None:
     campaign = safe_text(context.get("campaign")) or "default"
-    if message.text and message.text.lower() == "отмена":
+    if is_cancel_text(message.text):
         await message.answer(
             "Отменено.", reply_markup=types.ReplyKeyboardRemove()
         )
         await state.update_data(lead_context=None)
         return
 
-    if message.text and message.text.lower() == "ввести номер вручную":
+    if message.text and message.text.casefold() == MANUAL_PHONE_FOLDED:
         await message.answer("Введите номер в формате +7XXXXXXXXXX.")
         return
 
@@ -571,18 +711,7 @@ async def process_lead_message(
 
     await state.update_data(lead_context=None)
 
-    raw_username = message.from_user.username or ""
-    normalized_username = (
-        f"@{raw_username.lstrip('@').lower()}" if raw_username else ""
-    )
-
-    await stats.log_event(
-        message.from_user.id,
-        campaign,
-        "phone_received",
-        {"method": phone_source},
-        username=normalized_username or None,
-    )
+    normalized_username = normalize_username(message.from_user.username)
 
     timestamp = sheets.current_timestamp()
     lead_payload = {
@@ -596,103 +725,119 @@ async def process_lead_message(
     }
 
     settings = get_settings()
-    sheet_error: Optional[str] = None
     operation = "append"
-    try:
+
+    async def _write_lead() -> None:
+        nonlocal operation
         if settings.leads_upsert:
-            leads = await sheets.read("leads")
-            existing = next(
-                (
-                    item
-                    for item in leads
-                    if str(item.get("user_id")) == str(message.from_user.id)
-                    and safe_text(item.get("campaign")) == campaign
-                ),
-                None,
+            updated = await lead_index.update_lead(
+                message.from_user.id,
+                campaign,
+                normalized_phone,
+                {
+                    "phone": normalized_phone,
+                    "username": normalized_username,
+                    "updated_at": timestamp.utc_text,
+                },
+                optional_headers=["updated_at_msk"],
+                meta=timestamp.meta,
             )
-            if existing:
+            if updated:
                 operation = "update"
-                await sheets.update_row(
-                    "leads",
-                    existing["row"],
-                    {
-                        "phone": normalized_phone,
-                        "username": normalized_username,
-                        "updated_at": dt.datetime.utcnow().isoformat(),
-                    },
-                    optional_headers=["updated_at_msk"],
-                    meta=timestamp.meta,
-                )
-            else:
-                await sheets.append(
-                    "leads",
-                    lead_payload,
-                    optional_headers=["created_at_msk"],
-                    meta=timestamp.meta,
-                )
+                return
+            row = await sheets_writer.enqueue(
+                "leads", lead_payload, optional_headers=["created_at_msk"]
+            )
+            lead_index.remember(message.from_user.id, campaign, row, normalized_phone)
         else:
-            await sheets.append(
-                "leads",
-                lead_payload,
-                optional_headers=["created_at_msk"],
-                meta=timestamp.meta,
+            await sheets_writer.enqueue(
+                "leads", lead_payload, optional_headers=["created_at_msk"]
             )
-        await stats.log_event(
-            message.from_user.id,
-            campaign,
-            "sheets_write_ok",
-            {"sheet": "leads", "operation": operation},
-            username=normalized_username or None,
-        )
+
+    stats.log_event_nowait(
+        message.from_user.id,
+        campaign,
+        "phone_received",
+        {"method": phone_source},
+        username=normalized_username or None,
+    )
+
+    sheet_error: Optional[str] = None
+    try:
+        await _write_lead()
     except Exception:  # pragma: no cover - defensive
         sheet_error = "DB_WRITE_FAILED"
         logger.exception("Failed to write lead to Google Sheets")
-        await stats.log_event(
+        stats.log_event_nowait(
             message.from_user.id,
             campaign,
             "sheets_write_failed",
             {"sheet": "leads", "operation": operation, "error": sheet_error},
             username=normalized_username or None,
         )
+    else:
+        stats.log_event_nowait(
+            message.from_user.id,
+            campaign,
+            "sheets_write_ok",
+            {"sheet": "leads", "operation": operation},
+            username=normalized_username or None,
+        )
 
-    await db.upsert_lead(message.from_user.id, campaign)
-
-    await stats.log_event(
+    stats.log_event_nowait(
         message.from_user.id,
         campaign,
         "lead",
         {"username": normalized_username, "phone_saved": sheet_error is None},
         username=normalized_username or None,
     )
-    await message.answer(
-        "Спасибо! Свяжемся, уточним точные даты и оплату 👌",
-        reply_markup=types.ReplyKeyboardRemove(),
+    # The local lead record and the reply to the user are independent.
+    upsert_result, answer_result = await asyncio.gather(
+        db.upsert_lead(message.from_user.id, campaign),
+        message.answer(
+            "Спасибо! Свяжемся, уточним точные даты и оплату 👌",
+            reply_markup=types.ReplyKeyboardRemove(),
+        ),
+        return_exceptions=True,
     )
-    await alerts.notify_new_lead(
-        message.bot,
-        user_id=message.from_user.id,
-        username=normalized_username or None,
-        phone=normalized_phone,
-        campaign=campaign,
-        created_at=timestamp.moment,
-        title="🆕 Новый лид (Интенсив)",
-        error=sheet_error,
+    if isinstance(upsert_result, BaseException):
+        logger.error("Failed to store lead locally", exc_info=upsert_result)
+    spawn(
+        alerts.notify_new_lead(
+            message.bot,
+            user_id=message.from_user.id,
+            username=normalized_username or None,
+            phone=normalized_phone,
+            campaign=campaign,
+            created_at=timestamp.moment,
+            title="🆕 Новый лид (Интенсив)",
+            error=sheet_error,
+        ),
+        name="notify_new_lead",
     )
+    if isinstance(answer_result, BaseException):
+        raise answer_result
+
+
+_CALLBACK_ROUTES: Dict[str, Callable[[types.CallbackQuery, FSMContext], Awaitable[None]]] = {
+    "intensive_check_sub": callback_check_sub,
+    "qa_topic": callback_topic,
+    "qa_menu": callback_menu,
+    "intensive_lead": callback_lead,
+}
+
+
+async def intensive_callback(call: types.CallbackQuery, state: FSMContext) -> None:
+    handler = _CALLBACK_ROUTES.get(call.data.partition(":")[0])
+    if handler:
+        await handler(call, state)
 
 
 def register(dp: Dispatcher) -> None:
     dp.register_message_handler(cmd_intensive, commands=["intensive"], state="*")
     dp.register_callback_query_handler(
-        callback_check_sub,
-        lambda c: c.data and c.data.startswith("intensive_check_sub:"),
-    )
-    dp.register_callback_query_handler(
-        callback_topic, lambda c: c.data and c.data.startswith("qa_topic:")
+        intensive_callback, Text(startswith=[f"{prefix}:" for prefix in _CALLBACK_ROUTES])
     )
-    dp.register_callback_query_handler(
-        callback_menu, lambda c: c.data and c.data.startswith("qa_menu:")
-    )
-    dp.register_callback_query_handler(
-        callback_lead, lambda c: c.data and c.data.startswith("intensive_lead:")
+    dp.register_message_handler(
+        qa_text_handler, _has_intensive_session, content_types=["text"], state="*"
     )
-    dp.register_message_handler(qa_text_handler, content_types=["text"], state="*")
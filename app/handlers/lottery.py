@@ -3,6 +3,7 @@ from __future__ import annotations
 import datetime as dt
 
 from aiogram import Dispatcher, types
+from aiogram.dispatcher.filters import Text
 
 from app.keyboards.lottery import kb_lottery_result, kb_lottery_windows
 from app.services import lottery as lottery_service, stats
@@ -384,5 +385,5 @@ async def callback_lottery_claim(call: types.CallbackQuery) -> None:
 
 
 def register(dp: Dispatcher) -> None:
-    dp.register_callback_query_handler(callback_lottery_pick, lambda c: c.data and c.data.startswith("lottery_pick:"))
-    dp.register_callback_query_handler(callback_lottery_claim, lambda c: c.data and c.data.startswith("lottery_claim:"))
+    dp.register_callback_query_handler(callback_lottery_pick, Text(startswith="lottery_pick:"))
+    dp.register_callback_query_handler(callback_lottery_claim, Text(startswith="lottery_claim:"))
@@ -6,6 +6,7 @@ from html import escape
 
 from aiogram import Dispatcher, types
 from aiogram.dispatcher import FSMContext
+from aiogram.dispatcher.filters import Text
 
 from app.config import get_settings, is_admin_user
 from app.keyboards.common import (
@@ -14,7 +15,7 @@ from app.keyboards.common import (
     kb_main_menu,
     kb_subscribe,
 )
-from app.services import alerts, coupons, reminders, stats, sub_check
+from app.services import alerts, coupons, media, reminders, stats, sub_check
 from app.services import lottery as lottery_service
 from app.services.deep_link import parse_start_payload
 from app.storage import db
@@ -24,6 +25,7 @@ logger = logging.getLogger(__name__)
 
 MEDIA_DIR = Path(__file__).resolve().parents[2]
 WELCOME_VIDEO = MEDIA_DIR / "IMG_3109.MP4"
+_WELCOME_VIDEO_FILE = str(WELCOME_VIDEO) if WELCOME_VIDEO.exists() else None
 WELCOME_TEXT = (
     "👋 Добрый день! Рады приветствовать вас в нашем Телеграм-боте!\n\n"
     "Я – Академик, ваш проводник по миру знаний и возможностей нашей Академии.\n"
@@ -195,9 +197,10 @@ async def cmd_start(message: types.Message, state: FSMContext) -> None:
             await state.update_data(lottery_autostart=None)
             return
 
-    if WELCOME_VIDEO.exists():
-        await message.answer_video(
-            types.InputFile(str(WELCOME_VIDEO)),
+    if _WELCOME_VIDEO_FILE:
+        await media.answer_video(
+            message,
+            _WELCOME_VIDEO_FILE,
             caption=WELCOME_TEXT,
             reply_markup=subscribe_markup,
         )
@@ -532,15 +535,15 @@ def register(dp: Dispatcher) -> None:
     dp.register_message_handler(cmd_start, commands=["start"], state="*")
     dp.register_message_handler(
         message_leave_phone,
-        lambda m: m.text == "📞 Оставить контакт",
+        Text(equals="📞 Оставить контакт"),
         state="*",
     )
     dp.register_message_handler(
         message_open_intensive,
-        lambda m: m.text == "🥐 Производственный интенсив",
+        Text(equals="🥐 Производственный интенсив"),
         state="*",
     )
-    dp.register_callback_query_handler(callback_check_sub, lambda c: c.data and c.data.startswith("check_sub:"))
-    dp.register_callback_query_handler(callback_get_gift, lambda c: c.data and c.data.startswith("get_gift:"))
-    dp.register_callback_query_handler(callback_start_lottery, lambda c: c.data and c.data.startswith("start_lottery:"))
-    dp.register_callback_query_handler(callback_leave_phone, lambda c: c.data and c.data.startswith("leave_phone:"))
+    dp.register_callback_query_handler(callback_check_sub, Text(startswith="check_sub:"))
+    dp.register_callback_query_handler(callback_get_gift, Text(startswith="get_gift:"))
+    dp.register_callback_query_handler(callback_start_lottery, Text(startswith="start_lottery:"))
+    dp.register_callback_query_handler(callback_leave_phone, Text(startswith="leave_phone:"))
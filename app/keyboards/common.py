@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 
 from aiogram.types import (
     InlineKeyboardButton,
@@ -13,6 +14,19 @@ from app.config import is_admin_user
 
 logger = logging.getLogger(__name__)
 
+CANCEL_TEXT = "Отмена"
+_CANCEL_FOLDED = CANCEL_TEXT.casefold()
+_CANCEL_TEXTS = frozenset({CANCEL_TEXT, _CANCEL_FOLDED, CANCEL_TEXT.upper()})
+
+
+def is_cancel_text(text: str | None) -> bool:
+    """Match the «Отмена» reply button or the word typed in any case."""
+    if not text:
+        return False
+    if text in _CANCEL_TEXTS:
+        return True
+    return len(text) == len(CANCEL_TEXT) and text.casefold() == _CANCEL_FOLDED
+
 
 def kb_subscribe(url: str) -> InlineKeyboardMarkup:
     kb = InlineKeyboardMarkup(row_width=1)
@@ -26,23 +40,33 @@ def kb_check_sub(campaign: str) -> InlineKeyboardMarkup:
     return kb
 
 
+# Campaigns come from a handful of deep links, so the few variants are shared.
+@lru_cache(maxsize=64)
 def kb_get_gift(campaign: str) -> InlineKeyboardMarkup:
     kb = InlineKeyboardMarkup(row_width=1)
     kb.add(InlineKeyboardButton(text="🎁 Забрать подарок", callback_data=f"get_gift:{campaign}"))
     return kb
 
 
-def kb_main_menu(user_id: int | None = None, username: str | None = None) -> ReplyKeyboardMarkup:
+def _build_main_menu(with_admin: bool) -> ReplyKeyboardMarkup:
     kb = ReplyKeyboardMarkup(resize_keyboard=True)
     kb.add(KeyboardButton(text="📞 Оставить контакт"))
     kb.add(KeyboardButton(text="🥐 Производственный интенсив"))
-    is_admin = is_admin_user(user_id, username)
-    logger.info(f"kb_main_menu: user_id={user_id}, username={username}, is_admin={is_admin}")
-    if is_admin:
+    if with_admin:
         kb.add(KeyboardButton(text="Админ-панель"))
     return kb
 
 
+# The menu is static apart from the admin button, so both variants are built once.
+_MAIN_MENU = {False: _build_main_menu(False), True: _build_main_menu(True)}
+
+
+def kb_main_menu(user_id: int | None = None, username: str | None = None) -> ReplyKeyboardMarkup:
+    is_admin = is_admin_user(user_id, username)
+    logger.debug("kb_main_menu: user_id=%s, username=%s, is_admin=%s", user_id, username, is_admin)
+    return _MAIN_MENU[is_admin]
+
+
 def kb_after_coupon(
     campaign: str,
     user_id: int | None = None,
@@ -51,13 +75,20 @@ def kb_after_coupon(
     return kb_main_menu(user_id=user_id, username=username)
 
 
-def kb_send_contact() -> ReplyKeyboardMarkup:
+def _build_send_contact() -> ReplyKeyboardMarkup:
     kb = ReplyKeyboardMarkup(resize_keyboard=True, one_time_keyboard=True)
     kb.add(KeyboardButton(text="📞 Отправить номер", request_contact=True))
-    kb.add(KeyboardButton(text="Отмена"))
+    kb.add(KeyboardButton(text=CANCEL_TEXT))
     return kb
 
 
+_SEND_CONTACT = _build_send_contact()
+
+
+def kb_send_contact() -> ReplyKeyboardMarkup:
+    return _SEND_CONTACT
+
+
 def kb_admin_panel() -> InlineKeyboardMarkup:
     kb = InlineKeyboardMarkup(row_width=1)
     kb.add(InlineKeyboardButton(text="➕ Добавить купон", callback_data="admin:add_coupon"))
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Sequence
+
 from aiogram.types import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -7,11 +10,24 @@ from aiogram.types import (
     ReplyKeyboardMarkup,
 )
 
+from app.keyboards.common import is_cancel_text
 from app.utils import safe_text
 
+MANUAL_PHONE_TEXT = "Ввести номер вручную"
+MANUAL_PHONE_FOLDED = MANUAL_PHONE_TEXT.casefold()
+
+
+def is_lead_reply_text(text: str | None) -> bool:
+    """Text that could answer the phone prompt: a number, «Отмена» or the manual-entry button."""
+    if not text or text.startswith("/"):
+        return False
+    if is_cancel_text(text) or any(char.isdigit() for char in text):
+        return True
+    return len(text) == len(MANUAL_PHONE_FOLDED) and text.casefold() == MANUAL_PHONE_FOLDED
+
 
 def qa_topics_keyboard(
-    campaign: str, topics: list[tuple[str, str]]
+    campaign: str, topics: Sequence[tuple[str, str]]
 ) -> InlineKeyboardMarkup:
     campaign_value = safe_text(campaign) or "default"
     markup = InlineKeyboardMarkup(row_width=1)
@@ -26,6 +42,7 @@ def qa_topics_keyboard(
     return markup
 
 
+@lru_cache(maxsize=64)
 def qa_answer_keyboard(campaign: str) -> InlineKeyboardMarkup:
     campaign_value = safe_text(campaign) or "default"
     markup = InlineKeyboardMarkup(row_width=1)
@@ -44,13 +61,13 @@ def qa_answer_keyboard(campaign: str) -> InlineKeyboardMarkup:
     return markup
 
 
-def qa_menu_keyboard(campaign: str, topics: list[tuple[str, str]]) -> InlineKeyboardMarkup:
+def qa_menu_keyboard(campaign: str, topics: Sequence[tuple[str, str]]) -> InlineKeyboardMarkup:
     return qa_topics_keyboard(campaign, topics)
 
 
 def kb_request_phone() -> ReplyKeyboardMarkup:
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, one_time_keyboard=True)
     keyboard.add(KeyboardButton(text="📱 Отправить телефон", request_contact=True))
-    keyboard.add(KeyboardButton(text="Ввести номер вручную"))
+    keyboard.add(KeyboardButton(text=MANUAL_PHONE_TEXT))
     keyboard.add(KeyboardButton(text="Отмена"))
     return keyboard
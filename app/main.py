@@ -12,16 +12,19 @@ import uvicorn
 
 from app.bot import bot, dp
 from app.config import get_settings
-from app.services import reminders
+from app.services import reminders, sheets, sheets_writer
+from app.utils import spawn
 
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> None:
     await reminders.on_startup(bot)
+    spawn(sheets.get_client(), name="sheets_warm_up")
     try:
         yield
     finally:
+        await sheets_writer.flush()
         await reminders.on_shutdown()
 
 
@@ -71,9 +74,11 @@ async def drop_webhook() -> None:
 
 async def _on_polling_startup(dp: Dispatcher) -> None:
     await reminders.on_startup(dp.bot)
+    spawn(sheets.get_client(), name="sheets_warm_up")
 
 
 async def _on_polling_shutdown(dp: Dispatcher) -> None:
+    await sheets_writer.flush()
     await reminders.on_shutdown()
 
 
@@ -16,13 +16,25 @@ from aiogram.dispatcher.handler import current_handler
 from aiogram.utils.exceptions import TelegramAPIError
 
 from app.config import get_settings
-from app.services import stats
+from app.services import outbound, stats
 from app.utils import safe_text
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_ALERT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+_LEAD_ALERT_TEMPLATE = (
+    "{title}\n"
+    "ID: <code>{user_id}</code>\n"
+    "Профиль: <a href=\"{link}\">{label}</a>\n"
+    "Телефон: <code>{phone}</code>\n"
+    "Кампания: <code>{campaign}</code>\n"
+    "Создано: <code>{created}</code>\n"
+    "UTC: <code>{utc}</code>\n"
+    "{error_line}"
+    "Ответить в ЛС/созвонить в рабочее время"
+)
+
 
 @dataclass
 class ErrorAlert:
@@ -88,24 +100,18 @@ class AlertManager:
         local_display = _format_lead_timestamp(created_at, settings)
         utc_display = _format_utc_timestamp(created_at)
         mention = self._mention_line(settings)
-        user_display = html.escape(user_id_text or "—")
-        display_phone_escaped = html.escape(display_phone)
-        campaign_display = html.escape(campaign_text)
-        local_display = safe_text(local_display)
-        title_text = safe_text(title) or "🆕 Новый лид"
-        body_lines = [
-            title_text,
-            f"ID: <code>{user_display}</code>",
-            f"Профиль: <a href=\"{html.escape(link)}\">{html.escape(label)}</a>",
-            f"Телефон: <code>{display_phone_escaped}</code>",
-            f"Кампания: <code>{campaign_display or 'default'}</code>",
-            f"Создано: <code>{html.escape(local_display)}</code>",
-            f"UTC: <code>{html.escape(utc_display)}</code>",
-        ]
-        if error:
-            body_lines.append(f"Ошибка: <code>{html.escape(error)}</code>")
-        body_lines.append("Ответить в ЛС/созвонить в рабочее время")
-        message = self._compose_message(mention, body_lines)
+        body = _LEAD_ALERT_TEMPLATE.format(
+            title=safe_text(title) or "🆕 Новый лид",
+            user_id=html.escape(user_id_text or "—"),
+            link=html.escape(link),
+            label=html.escape(label),
+            phone=html.escape(display_phone),
+            campaign=html.escape(campaign_text),
+            created=html.escape(safe_text(local_display)),
+            utc=html.escape(utc_display),
+            error_line=f"Ошибка: <code>{html.escape(error)}</code>\n" if error else "",
+        )
+        message = self._compose_message(mention, [body])
         meta = {
             "type": "new_lead",
             "campaign": campaign_text,
@@ -283,7 +289,7 @@ class AlertManager:
         errors: List[str] = []
         for index, chat_id in enumerate(targets):
             try:
-                await bot.send_message(chat_id, message, disable_web_page_preview=True)
+                await outbound.send_message(bot, chat_id, message, disable_web_page_preview=True)
                 await stats.log_event(
                     user_id or 0,
                     campaign or "system",
@@ -367,8 +373,10 @@ class AlertManager:
     ) -> tuple[str, str]:
         username_text = safe_text(username)
         if username_text:
-            normalized = safe_text(username_text.lstrip("@"))
-            return (f"https://t.me/{normalized}", f"@{normalized}")
+            # Lead handlers already pass ``@username`` from normalize_username().
+            if username_text[0] == "@":
+                return (f"https://t.me/{username_text[1:]}", username_text)
+            return (f"https://t.me/{username_text}", f"@{username_text}")
         user_id_text = safe_text(user_id) or "0"
         return (f"tg://user?id={user_id_text}", user_id_text)
 
@@ -6,18 +6,18 @@ from app.services import sheets
 from app.utils import safe_text
 
 COUPONS_SHEET = "coupons"
+FREE_STATUSES = frozenset({"", "free"})
 
 
 async def find_first_free_coupon(campaign: str | None) -> Optional[Dict[str, str]]:
     campaign_filter = safe_text(campaign)
     records = await sheets.read(COUPONS_SHEET)
     for record in records:
+        if safe_text(record.get("status")).lower() not in FREE_STATUSES:
+            continue
         record_campaign = safe_text(record.get("campaign"))
         if campaign_filter and record_campaign and record_campaign != campaign_filter:
             continue
-        status = safe_text(record.get("status")).lower()
-        if status not in {"", "free"}:
-            continue
         code = safe_text(record.get("code"))
         if not code:
             continue
@@ -68,6 +68,16 @@ async def get_user_coupon(user_id: int, campaign: str | None = None) -> Optional
     return None
 
 
+def _new_coupon_row(code: str, campaign: str, timestamp: sheets.SheetTimestamp) -> Dict[str, str]:
+    return {
+        "code": code,
+        "campaign": campaign,
+        "status": "free",
+        "created_at": timestamp.utc_text,
+        "created_at_msk": timestamp.local_text,
+    }
+
+
 async def add_coupon(code: str, campaign: str = "") -> bool:
     """Add a new coupon to the coupons sheet."""
     sanitized_code = safe_text(code)
@@ -77,17 +87,9 @@ async def add_coupon(code: str, campaign: str = "") -> bool:
         return False
 
     timestamp = sheets.current_timestamp()
-    data = {
-        "code": sanitized_code,
-        "campaign": sanitized_campaign,
-        "status": "free",
-        "created_at": timestamp.utc_text,
-        "created_at_msk": timestamp.local_text,
-    }
-
     await sheets.append(
         COUPONS_SHEET,
-        data,
+        _new_coupon_row(sanitized_code, sanitized_campaign, timestamp),
         optional_headers=["created_at_msk"],
         meta=timestamp.meta,
     )
@@ -95,9 +97,12 @@ async def add_coupon(code: str, campaign: str = "") -> bool:
 
 
 async def add_multiple_coupons(codes: list[str], campaign: str = "") -> int:
-    """Add multiple coupons at once. Returns count of added coupons."""
-    count = 0
-    for code in codes:
-        if await add_coupon(code, campaign):
-            count += 1
-    return count
+    """Add multiple coupons at once, skipping repeats. Returns count of added coupons."""
+    sanitized_campaign = safe_text(campaign)
+    timestamp = sheets.current_timestamp()
+    unique_codes = dict.fromkeys(code for code in map(safe_text, codes) if code)
+    rows = [
+        _new_coupon_row(code, sanitized_campaign, timestamp) for code in unique_codes
+    ]
+    await sheets.append_many(COUPONS_SHEET, rows, optional_headers=["created_at_msk"])
+    return len(rows)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
 
+@lru_cache(maxsize=1024)
 def parse_start_payload(text: Optional[str], default: str = "default") -> str:
     if not text:
         return default
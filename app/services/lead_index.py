@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Tuple
+
+from app.services import phone, sheets
+from app.utils import safe_text
+
+logger = logging.getLogger(__name__)
+
+LEADS_SHEET = "leads"
+INDEX_TTL_SECONDS = 300
+
+_rows: Dict[Tuple[str, str], int] = {}
+_phone_rows: Dict[Tuple[str, str], int] = {}
+_loaded_at: float | None = None
+_load_lock = asyncio.Lock()
+
+
+def _key(user_id: Any, campaign: Any) -> Tuple[str, str]:
+    return str(user_id), safe_text(campaign)
+
+
+def _is_fresh() -> bool:
+    return _loaded_at is not None and time.monotonic() - _loaded_at < INDEX_TTL_SECONDS
+
+
+async def _ensure_loaded() -> None:
+    global _loaded_at
+    if _is_fresh():
+        return
+    async with _load_lock:
+        if _is_fresh():
+            return
+        columns = await sheets.read_columns(LEADS_SHEET, ["user_id", "campaign", "phone"])
+        user_ids, campaigns, phones = columns["user_id"], columns["campaign"], columns["phone"]
+        rows: Dict[Tuple[str, str], int] = {}
+        phone_rows: Dict[Tuple[str, str], int] = {}
+        for offset in range(max(len(user_ids), len(phones))):
+            row = offset + 2
+            campaign = campaigns[offset] if offset < len(campaigns) else ""
+            user_id = user_ids[offset] if offset < len(user_ids) else ""
+            if user_id:
+                rows.setdefault(_key(user_id, campaign), row)
+            raw_phone = phones[offset] if offset < len(phones) else ""
+            normalized_phone = phone.normalize(raw_phone) if raw_phone else None
+            if normalized_phone:
+                phone_rows.setdefault(_key(normalized_phone, campaign), row)
+        _rows.clear()
+        _rows.update(rows)
+        _phone_rows.clear()
+        _phone_rows.update(phone_rows)
+        _loaded_at = time.monotonic()
+    logger.debug("Loaded lead index with %s entries", len(rows))
+
+
+async def find_row(user_id: int, campaign: str, phone_number: str | None = None) -> int | None:
+    """Return the row of the first lead for ``user_id``/``campaign``.
+
+    When ``phone_number`` (already normalised) is given, a lead with the same
+    phone in the campaign also counts, so one person on two accounts is not
+    recorded twice.
+    """
+    await _ensure_loaded()
+    row = _rows.get(_key(user_id, campaign))
+    if row is None and phone_number:
+        row = _phone_rows.get(_key(phone_number, campaign))
+    return row
+
+
+def _row_matches(
+    values: Dict[str, str], user_id: int, campaign: str, phone_number: str | None
+) -> bool:
+    if _key(values.get("user_id", ""), values.get("campaign", "")) == _key(user_id, campaign):
+        return True
+    if safe_text(values.get("campaign", "")) != safe_text(campaign):
+        return False
+    raw_phone = values.get("phone", "")
+    return bool(phone_number and raw_phone and phone.normalize(raw_phone) == phone_number)
+
+
+async def update_lead(
+    user_id: int,
+    campaign: str,
+    phone_number: str | None,
+    data: Dict[str, Any],
+    *,
+    optional_headers: Iterable[str] | None = None,
+    meta: Dict[str, Any] | None = None,
+) -> bool:
+    """Update the existing lead for ``user_id``/``campaign`` with ``data``.
+
+    The indexed row is checked against the sheet before writing; if editors
+    have moved rows since the index was loaded it is reloaded and the lookup
+    retried. Returns False when no matching lead row was found.
+    """
+    for _ in range(2):
+        row = await find_row(user_id, campaign, phone_number)
+        if row is None:
+            return False
+        updated = await sheets.update_row(
+            LEADS_SHEET,
+            row,
+            data,
+            optional_headers=optional_headers,
+            meta=meta,
+            expected=lambda values: _row_matches(values, user_id, campaign, phone_number),
+        )
+        if updated:
+            return True
+        logger.warning("Lead index row %d no longer matches the sheet, reloading", row)
+        invalidate()
+    return False
+
+
+def remember(
+    user_id: int, campaign: str, row: int | None, phone_number: str | None = None
+) -> None:
+    """Record a freshly appended lead, or drop the index if its row is unknown."""
+    if row is None:
+        invalidate()
+        return
+    _rows.setdefault(_key(user_id, campaign), row)
+    if phone_number:
+        _phone_rows.setdefault(_key(phone_number, campaign), row)
+
+
+def invalidate() -> None:
+    global _loaded_at
+    _loaded_at = None
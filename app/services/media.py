@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import types
+from aiogram.utils.exceptions import BadRequest
+
+from app.storage import db
+from app.utils import spawn
+
+logger = logging.getLogger(__name__)
+
+# Telegram keeps every uploaded file; sending its file_id again skips the
+# upload entirely. Ids are keyed by the bundled file path.
+_file_ids: Dict[str, str] = {}
+_loaded = False
+_load_lock = asyncio.Lock()
+
+
+async def _ensure_loaded() -> None:
+    global _loaded
+    if _loaded:
+        return
+    async with _load_lock:
+        if _loaded:
+            return
+        try:
+            stored = await db.fetch_media_file_ids()
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to load cached media file ids")
+            stored = {}
+        for path, file_id in stored.items():
+            _file_ids.setdefault(path, file_id)
+        _loaded = True
+
+
+def _remember(path: str, file_id: str | None) -> None:
+    if not file_id or _file_ids.get(path) == file_id:
+        return
+    _file_ids[path] = file_id
+    spawn(db.save_media_file_id(path, file_id), name="save_media_file_id")
+
+
+async def _answer_media(
+    path: str,
+    send: Callable[[Any], Awaitable[types.Message]],
+    file_id_of: Callable[[types.Message], str | None],
+) -> types.Message:
+    await _ensure_loaded()
+    file_id = _file_ids.get(path)
+    if file_id:
+        try:
+            return await send(file_id)
+        except BadRequest:
+            logger.warning("Cached file_id for %s was rejected, uploading again", path)
+            _file_ids.pop(path, None)
+    sent = await send(types.InputFile(path))
+    _remember(path, file_id_of(sent))
+    return sent
+
+
+def _photo_file_id(message: types.Message) -> str | None:
+    return message.photo[-1].file_id if message.photo else None
+
+
+def _video_file_id(message: types.Message) -> str | None:
+    return message.video.file_id if message.video else None
+
+
+async def answer_photo(message: types.Message, path: str, **kwargs: Any) -> types.Message:
+    return await _answer_media(
+        path,
+        lambda photo: message.answer_photo(photo, **kwargs),
+        _photo_file_id,
+    )
+
+
+async def answer_video(message: types.Message, path: str, **kwargs: Any) -> types.Message:
+    return await _answer_media(
+        path,
+        lambda video: message.answer_video(video, **kwargs),
+        _video_file_id,
+    )
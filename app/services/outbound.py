@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from aiogram import Bot, types
+
+# Telegram allows about 30 messages per second per bot. Proactive sends
+# (reminders, admin alerts) are kept below that so replies to users still
+# have headroom during a burst.
+PROACTIVE_MESSAGES_PER_SECOND = 20
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else rate
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated_at) * self._rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+_bucket = TokenBucket(PROACTIVE_MESSAGES_PER_SECOND)
+
+
+async def send_message(bot: Bot, chat_id: int | str, text: str, **kwargs: Any) -> types.Message:
+    """Send a message that is not a direct reply, respecting the shared rate limit."""
+    await _bucket.acquire()
+    return await bot.send_message(chat_id, text, **kwargs)
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 PHONE_RE = re.compile(r"7\d{10}")
+_NON_DIGITS_RE = re.compile(r"\D")
+# Separators people actually type; anything else falls back to the regex.
+_STRIP_SEPARATORS = str.maketrans("", "", " +-().")
 
 
+@lru_cache(maxsize=4096)
 def normalize(phone: str) -> str | None:
-    digits = re.sub(r"\D", "", phone)
+    digits = phone.translate(_STRIP_SEPARATORS)
+    if not digits.isdecimal():
+        digits = _NON_DIGITS_RE.sub("", phone)
     if digits.startswith("8"):
         digits = "7" + digits[1:]
     if digits.startswith("7") and len(digits) == 11:
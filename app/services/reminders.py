@@ -13,7 +13,7 @@ from zoneinfo import ZoneInfo
 
 from app.config import get_settings, is_admin_user
 from app.keyboards.common import kb_after_coupon
-from app.services import coupons, stats
+from app.services import coupons, outbound, stats
 from app.utils import safe_text
 from app.storage import db
 
@@ -325,7 +325,8 @@ class ReminderScheduler:
             text = text_template
 
         try:
-            await bot.send_message(
+            await outbound.send_message(
+                bot,
                 key.user_id,
                 text,
                 reply_markup=kb_after_coupon(key.campaign, key.user_id),
@@ -3,6 +3,8 @@ from __future__ import annotations
 import asyncio
 import datetime as dt
 import logging
+import re
+import time
 from dataclasses import dataclass
 from functools import lru_cache
 from typing import Any, Callable, Dict, Iterable, List, TypeVar
@@ -17,8 +19,15 @@ logger = logging.getLogger(__name__)
 
 _client_lock = asyncio.Lock()
 _client: gspread.Client | None = None
+_spreadsheet: gspread.Spreadsheet | None = None
+_worksheets: Dict[str, gspread.Worksheet] = {}
+_read_cache: Dict[str, tuple[float, List[Dict[str, Any]]]] = {}
+_read_locks: Dict[str, asyncio.Lock] = {}
+_read_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+_timestamp_cache: tuple[int, SheetTimestamp] | None = None
 
 DEFAULT_SHEETS_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_RANGE_START_ROW_RE = re.compile(r"![A-Z]+(\d+)")
 
 T = TypeVar("T")
 
@@ -42,6 +51,14 @@ def _column_letter(index: int) -> str:
     return letters
 
 
+def _row_from_response(response: Any) -> int | None:
+    if not isinstance(response, dict):
+        return None
+    updated_range = response.get("updates", {}).get("updatedRange") or ""
+    match = _RANGE_START_ROW_RE.search(updated_range)
+    return int(match.group(1)) if match else None
+
+
 async def get_client() -> gspread.Client:
     global _client
     if _client is None:
@@ -64,12 +81,23 @@ async def get_client() -> gspread.Client:
     return _client
 
 
+def _open_worksheet(client: gspread.Client, spreadsheet_id: str, sheet: str) -> gspread.Worksheet:
+    global _spreadsheet
+    if _spreadsheet is None:
+        _spreadsheet = client.open_by_key(spreadsheet_id)
+    worksheet = _spreadsheet.worksheet(sheet)
+    _worksheets[sheet] = worksheet
+    return worksheet
+
+
 async def _with_worksheet(sheet: str, worker: Callable[[gspread.Worksheet], T]) -> T:
     client = await get_client()
     settings = get_settings()
 
     def _call_worker() -> T:
-        worksheet = client.open_by_key(settings.google_sheets_id).worksheet(sheet)
+        worksheet = _worksheets.get(sheet)
+        if worksheet is None:
+            worksheet = _open_worksheet(client, settings.google_sheets_id, sheet)
         return worker(worksheet)
 
     return await asyncio.to_thread(_call_worker)
@@ -87,8 +115,17 @@ def _resolve_sheet_timezone(name: str | None) -> dt.tzinfo:
 
 
 def current_timestamp() -> SheetTimestamp:
+    """Return the current time at second precision, formatted for Sheets.
+
+    Calls within the same second share one SheetTimestamp.
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached = _timestamp_cache
+    if cached is not None and cached[0] == second:
+        return cached[1]
     settings = get_settings()
-    aware_utc = dt.datetime.now(dt.timezone.utc)
+    aware_utc = dt.datetime.fromtimestamp(second, dt.timezone.utc)
     utc_text = aware_utc.isoformat().replace("+00:00", "Z")
     timezone = _resolve_sheet_timezone(settings.sheets_tz)
     localized = aware_utc.astimezone(timezone)
@@ -100,11 +137,24 @@ def current_timestamp() -> SheetTimestamp:
             "Invalid SHEETS_TIME_FORMAT '%s', falling back to default", time_format
         )
         local_text = localized.strftime(DEFAULT_SHEETS_TIME_FORMAT)
-    return SheetTimestamp(moment=aware_utc, utc_text=utc_text, local_text=local_text)
-
-
-def _ensure_headers(ws: gspread.Worksheet, required_headers: Iterable[str]) -> List[str]:
-    headers = ws.row_values(1)
+    timestamp = SheetTimestamp(moment=aware_utc, utc_text=utc_text, local_text=local_text)
+    _timestamp_cache = (second, timestamp)
+    return timestamp
+
+
+def _ensure_headers(
+    ws: gspread.Worksheet,
+    required_headers: Iterable[str],
+    headers: List[str] | None = None,
+) -> List[str]:
+    """Add missing ``required_headers`` to row 1 and return the full header row.
+
+    Values are mapped to columns by position, so callers pass the header row
+    they read in the same request (or let it be read here) instead of a cached
+    copy: editors may insert or reorder columns at any time.
+    """
+    if headers is None:
+        headers = ws.row_values(1)
     ordered_required: List[str] = []
     seen: set[str] = set()
     for header in required_headers:
@@ -142,35 +192,72 @@ def _ensure_headers(ws: gspread.Worksheet, required_headers: Iterable[str]) -> L
     return headers
 
 
+def _prepare_headers(
+    ws: gspread.Worksheet, rows: Iterable[Dict[str, Any]], optional_set: set[str]
+) -> List[str]:
+    required: Dict[str, None] = {}
+    for row in rows:
+        required.update(dict.fromkeys(key for key in row if key not in optional_set))
+    headers = _ensure_headers(ws, required)
+    missing_optional = [header for header in optional_set if header not in headers]
+    if missing_optional:
+        logger.warning(
+            "Sheet %s is missing optional columns: %s",
+            ws.title,
+            ", ".join(missing_optional),
+        )
+    return headers
+
+
 async def append(
     sheet: str,
     row: Dict[str, Any],
     *,
     optional_headers: Iterable[str] | None = None,
     meta: Dict[str, Any] | None = None,
-) -> None:
+) -> int | None:
+    """Append ``row`` and return its sheet row number when the API reports it."""
     optional_set = {header for header in (optional_headers or []) if header}
 
-    def _append(ws: gspread.Worksheet) -> None:
-        headers = _ensure_headers(
-            ws, [key for key in row.keys() if key not in optional_set]
-        )
-        missing_optional = [header for header in optional_set if header not in headers]
-        if missing_optional:
-            logger.warning(
-                "Sheet %s is missing optional columns: %s",
-                ws.title,
-                ", ".join(missing_optional),
-            )
+    def _append(ws: gspread.Worksheet) -> int | None:
+        headers = _prepare_headers(ws, [row], optional_set)
         if meta:
             logger.info("Appending to %s with timestamp meta: %s", ws.title, meta)
         if headers:
             values = [row.get(header, "") for header in headers]
         else:
             values = list(row.values())
-        ws.append_row(values, value_input_option="USER_ENTERED")
+        response = ws.append_row(values, value_input_option="USER_ENTERED")
+        return _row_from_response(response)
 
-    await _with_worksheet(sheet, _append)
+    appended_row = await _with_worksheet(sheet, _append)
+    _cache_appended(sheet, [row], appended_row)
+    return appended_row
+
+
+async def append_many(
+    sheet: str,
+    rows: List[Dict[str, Any]],
+    *,
+    optional_headers: Iterable[str] | None = None,
+) -> int | None:
+    """Append ``rows`` in one request and return the first appended row number."""
+    if not rows:
+        return None
+    optional_set = {header for header in (optional_headers or []) if header}
+
+    def _append_many(ws: gspread.Worksheet) -> int | None:
+        headers = _prepare_headers(ws, rows, optional_set)
+        if headers:
+            values = [[row.get(header, "") for header in headers] for row in rows]
+        else:
+            values = [list(row.values()) for row in rows]
+        response = ws.append_rows(values, value_input_option="USER_ENTERED")
+        return _row_from_response(response)
+
+    first_row = await _with_worksheet(sheet, _append_many)
+    _cache_appended(sheet, rows, first_row)
+    return first_row
 
 
 async def read(sheet: str) -> List[Dict[str, Any]]:
@@ -186,6 +273,87 @@ async def read(sheet: str) -> List[Dict[str, Any]]:
     return await _with_worksheet(sheet, _read)
 
 
+async def read_columns(sheet: str, columns: Iterable[str]) -> Dict[str, List[str]]:
+    """Read only the named columns (below the header row) with one batchGet.
+
+    Each list is indexed from sheet row 2; unknown columns map to an empty list.
+    """
+    wanted = list(columns)
+
+    def _read_columns(ws: gspread.Worksheet) -> Dict[str, List[str]]:
+        headers = ws.row_values(1)
+        ranges: Dict[str, str] = {}
+        for name in wanted:
+            if name in headers:
+                letter = _column_letter(headers.index(name) + 1)
+                ranges[name] = f"'{ws.title}'!{letter}2:{letter}"
+        result: Dict[str, List[str]] = {name: [] for name in wanted}
+        if not ranges:
+            return result
+        response = ws.spreadsheet.values_batch_get(list(ranges.values()))
+        for name, value_range in zip(ranges, response.get("valueRanges", [])):
+            result[name] = [cells[0] if cells else "" for cells in value_range.get("values", [])]
+        return result
+
+    return await _with_worksheet(sheet, _read_columns)
+
+
+def _cache_appended(sheet: str, rows: List[Dict[str, Any]], first_row: int | None) -> None:
+    cached = _read_cache.get(sheet)
+    if cached is None:
+        return
+    if first_row is None:
+        _read_cache.pop(sheet, None)
+        return
+    records = cached[1]
+    for offset, row in enumerate(rows):
+        records.append({**row, "row": first_row + offset})
+
+
+def _cache_updated(sheet: str, row: int, data: Dict[str, Any]) -> None:
+    cached = _read_cache.get(sheet)
+    if cached is None:
+        return
+    records = cached[1]
+    index = row - 2
+    if 0 <= index < len(records) and records[index].get("row") == row:
+        records[index].update(data)
+    else:
+        _read_cache.pop(sheet, None)
+
+
+def _cached_records(sheet: str, ttl: float) -> List[Dict[str, Any]] | None:
+    cached = _read_cache.get(sheet)
+    if cached is None or time.monotonic() - cached[0] >= ttl:
+        return None
+    _read_cache_stats["hits"] += 1
+    return cached[1]
+
+
+async def read_cached(sheet: str, ttl: float | None = None) -> List[Dict[str, Any]]:
+    """Like read(), but reuses a result younger than ``ttl`` seconds.
+
+    ``ttl`` defaults to SHEETS_READ_CACHE_TTL. Rows written through this
+    module are applied to the cached result. The returned list is shared
+    between callers and must not be mutated.
+    """
+    if ttl is None:
+        ttl = get_settings().sheets_read_cache_ttl
+    records = _cached_records(sheet, ttl)
+    if records is not None:
+        return records
+    lock = _read_locks.setdefault(sheet, asyncio.Lock())
+    async with lock:
+        records = _cached_records(sheet, ttl)
+        if records is not None:
+            return records
+        _read_cache_stats["misses"] += 1
+        records = await read(sheet)
+        _read_cache[sheet] = (time.monotonic(), records)
+    logger.debug("Sheets read cache for %s refreshed, stats: %s", sheet, _read_cache_stats)
+    return records
+
+
 async def update_row(
     sheet: str,
     row: int,
@@ -193,15 +361,27 @@ async def update_row(
     *,
     optional_headers: Iterable[str] | None = None,
     meta: Dict[str, Any] | None = None,
-) -> None:
+    expected: Callable[[Dict[str, str]], bool] | None = None,
+) -> bool:
+    """Merge ``data`` into ``row`` of ``sheet``.
+
+    When ``expected`` is given it is called with the row's current values
+    (by header) and the row is left untouched if it returns False. Returns
+    whether the row was written.
+    """
     optional_set = {header for header in (optional_headers or []) if header}
 
-    def _update(ws: gspread.Worksheet) -> None:
+    def _update(ws: gspread.Worksheet) -> bool:
+        # One request for both the header row and the target row.
+        header_range, row_range = ws.batch_get(["1:1", f"{row}:{row}"])
+        current_values = row_range[0] if row_range else []
         headers = _ensure_headers(
-            ws, [key for key in data.keys() if key not in optional_set]
+            ws,
+            [key for key in data.keys() if key not in optional_set],
+            header_range[0] if header_range else [],
         )
         if not headers:
-            return
+            return False
         missing_optional = [header for header in optional_set if header not in headers]
         if missing_optional:
             logger.warning(
@@ -213,13 +393,18 @@ async def update_row(
             logger.info(
                 "Updating %s row %d with timestamp meta: %s", ws.title, row, meta
             )
-        current_values = ws.row_values(row)
         merged = {header: "" for header in headers}
         for header, value in zip(headers, current_values):
             merged[header] = value
+        if expected is not None and not expected(dict(merged)):
+            return False
         merged.update(data)
         values = [merged.get(header, "") for header in headers]
         end_col = _column_letter(len(values))
         ws.update(f"A{row}:{end_col}{row}", [values])
+        return True
 
-    await _with_worksheet(sheet, _update)
+    updated = await _with_worksheet(sheet, _update)
+    if updated:
+        _cache_updated(sheet, row, data)
+    return updated
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Tuple
+
+from app.services import sheets
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_ROWS = 50
+BATCH_DELAY_SECONDS = 0.2
+DROP_LOG_EVERY = 100
+
+
+@dataclass
+class _PendingRow:
+    row: Dict[str, Any]
+    optional_headers: Tuple[str, ...]
+    future: asyncio.Future[int | None]
+
+
+_queues: Dict[str, Deque[_PendingRow]] = {}
+_workers: Dict[str, asyncio.Task[None]] = {}
+_dropped: Dict[str, int] = {}
+
+
+def _retrieve_exception(future: asyncio.Future[int | None]) -> None:
+    # Failures are logged by the worker; callers that do not await the
+    # future should not trigger "exception was never retrieved" warnings.
+    if not future.cancelled():
+        future.exception()
+
+
+def enqueue(
+    sheet: str,
+    row: Dict[str, Any],
+    *,
+    optional_headers: Iterable[str] | None = None,
+    max_queued: int | None = None,
+) -> asyncio.Future[int | None]:
+    """Queue ``row`` for a batched append to ``sheet``.
+
+    The returned future resolves to the appended row number (or None when
+    the API does not report it) once the batch has been written. With
+    ``max_queued`` set, the oldest pending rows of the sheet are dropped
+    (their futures cancelled) to keep the backlog within that bound.
+    """
+    future: asyncio.Future[int | None] = asyncio.get_running_loop().create_future()
+    future.add_done_callback(_retrieve_exception)
+    queue = _queues.setdefault(sheet, deque())
+    if max_queued is not None:
+        while len(queue) >= max_queued:
+            queue.popleft().future.cancel()
+            _dropped[sheet] = _dropped.get(sheet, 0) + 1
+            if _dropped[sheet] % DROP_LOG_EVERY == 1:
+                logger.warning(
+                    "Sheets write backlog for %s is full, dropped %d rows so far",
+                    sheet,
+                    _dropped[sheet],
+                )
+    queue.append(_PendingRow(row, tuple(optional_headers or ()), future))
+    worker = _workers.get(sheet)
+    if worker is None or worker.done():
+        _workers[sheet] = asyncio.create_task(_drain(sheet), name=f"sheets_writer:{sheet}")
+    return future
+
+
+async def _drain(sheet: str) -> None:
+    queue = _queues[sheet]
+    while queue:
+        if len(queue) < BATCH_MAX_ROWS:
+            await asyncio.sleep(BATCH_DELAY_SECONDS)
+        batch = [queue.popleft() for _ in range(min(len(queue), BATCH_MAX_ROWS))]
+        optional_headers = {header for item in batch for header in item.optional_headers}
+        try:
+            first_row = await sheets.append_many(
+                sheet,
+                [item.row for item in batch],
+                optional_headers=optional_headers,
+            )
+        except Exception as exc:
+            logger.exception("Failed to append %d rows to sheet %s", len(batch), sheet)
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            continue
+        for offset, item in enumerate(batch):
+            if not item.future.done():
+                item.future.set_result(None if first_row is None else first_row + offset)
+
+
+async def flush() -> None:
+    """Wait until every queued row has been written (or has failed)."""
+    pending = [worker for worker in _workers.values() if not worker.done()]
+    while pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        pending = [worker for worker in _workers.values() if not worker.done()]
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Dict
 
-from app.services import sheets
+import orjson
 
+from app.services import sheets, sheets_writer
 
-async def log_event(
+EVENTS_SHEET = "events"
+# Events are best-effort: under a long Sheets outage keep at most this many.
+MAX_QUEUED_EVENTS = 10_000
+
+
+def log_event_nowait(
     user_id: int,
     campaign: str,
     step: str,
@@ -14,6 +19,7 @@ async def log_event(
     *,
     username: str | None = None,
 ) -> None:
+    """Queue an event row; it is written to Sheets in the next batch."""
     meta_payload: Dict[str, Any] = {}
     if meta:
         meta_payload.update(meta)
@@ -22,14 +28,26 @@ async def log_event(
     if username:
         meta_payload.setdefault("username", username)
     timestamp = sheets.current_timestamp()
+    # meta_json is compact JSON ({"a":1}); non-string keys are written as strings.
     data = {
         "ts": timestamp.utc_text,
         "ts_msk": timestamp.local_text,
         "user_id": user_id,
         "campaign": campaign or "default",
         "step": step,
-        "meta_json": json.dumps(meta_payload, ensure_ascii=False),
+        "meta_json": orjson.dumps(meta_payload, option=orjson.OPT_NON_STR_KEYS).decode(),
     }
-    await sheets.append(
-        "events", data, optional_headers=["ts_msk"], meta=timestamp.meta
+    sheets_writer.enqueue(
+        EVENTS_SHEET, data, optional_headers=["ts_msk"], max_queued=MAX_QUEUED_EVENTS
     )
+
+
+async def log_event(
+    user_id: int,
+    campaign: str,
+    step: str,
+    meta: Dict[str, Any] | None = None,
+    *,
+    username: str | None = None,
+) -> None:
+    log_event_nowait(user_id, campaign, step, meta, username=username)
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import time
+from typing import Dict
+
 from aiogram import Bot
 from aiogram.utils import exceptions
 
 from app.config import get_settings
 
+# Only confirmed memberships are cached: a user who has just subscribed must
+# not be told "not subscribed" from a stale entry.
+MEMBER_CACHE_TTL_SECONDS = 120
+MEMBER_CACHE_MAX_SIZE = 10_000
+
+_MEMBER_STATUSES = frozenset({"member", "administrator", "creator"})
+_confirmed_at: Dict[int, float] = {}
+
+
+def _prune(now: float) -> None:
+    for user_id, confirmed_at in list(_confirmed_at.items()):
+        if now - confirmed_at >= MEMBER_CACHE_TTL_SECONDS:
+            del _confirmed_at[user_id]
+
 
 async def is_member(bot: Bot, user_id: int) -> bool:
+    now = time.monotonic()
+    confirmed_at = _confirmed_at.get(user_id)
+    if confirmed_at is not None and now - confirmed_at < MEMBER_CACHE_TTL_SECONDS:
+        return True
     settings = get_settings()
     try:
         member = await bot.get_chat_member(settings.channel_username, user_id)
     except exceptions.TelegramAPIError:
         return False
-    return member.status in {"member", "administrator", "creator"}
+    if member.status not in _MEMBER_STATUSES:
+        _confirmed_at.pop(user_id, None)
+        return False
+    if len(_confirmed_at) >= MEMBER_CACHE_MAX_SIZE:
+        _prune(now)
+    _confirmed_at[user_id] = now
+    return True
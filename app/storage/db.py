@@ -10,9 +10,22 @@ import aiosqlite
 _db_lock = asyncio.Lock()
 _db_path = Path("data")
 _db_file = _db_path / "bot.sqlite3"
+_initialized = False
 
 
 async def init_db() -> None:
+    # Every query helper calls this; the schema only needs creating once per process.
+    global _initialized
+    if _initialized:
+        return
+    async with _db_lock:
+        if _initialized:
+            return
+        await _create_schema()
+        _initialized = True
+
+
+async def _create_schema() -> None:
     _db_path.mkdir(parents=True, exist_ok=True)
     async with aiosqlite.connect(_db_file) as db:
         await db.execute(
@@ -50,10 +63,16 @@ async def init_db() -> None:
                 user_id INTEGER NOT NULL,
                 campaign TEXT NOT NULL,
                 created_at TEXT NOT NULL,
+                created_at_epoch REAL,
                 PRIMARY KEY(user_id, campaign)
             )
             """
         )
+        cursor = await db.execute("PRAGMA table_info(leads)")
+        lead_columns = {row[1] for row in await cursor.fetchall()}
+        await cursor.close()
+        if "created_at_epoch" not in lead_columns:
+            await db.execute("ALTER TABLE leads ADD COLUMN created_at_epoch REAL")
         await db.execute(
             """
             CREATE TABLE IF NOT EXISTS lottery_sessions (
@@ -84,6 +103,15 @@ async def init_db() -> None:
             )
             """
         )
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS media_files (
+                path TEXT PRIMARY KEY,
+                file_id TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
         await db.execute(
             """
             CREATE INDEX IF NOT EXISTS idx_lottery_sessions_user_campaign
@@ -134,7 +162,8 @@ async def get_lead(user_id: int, campaign: str) -> Optional[Dict[str, Any]]:
     async with aiosqlite.connect(_db_file) as db:
         db.row_factory = aiosqlite.Row
         cursor = await db.execute(
-            "SELECT user_id, campaign, created_at FROM leads WHERE user_id=? AND campaign=?",
+            "SELECT user_id, campaign, created_at, created_at_epoch FROM leads "
+            "WHERE user_id=? AND campaign=?",
             (user_id, campaign),
         )
         row = await cursor.fetchone()
@@ -158,10 +187,12 @@ async def has_any_lottery_draw(user_id: int) -> bool:
 
 async def upsert_lead(user_id: int, campaign: str) -> None:
     await init_db()
+    created_at = dt.datetime.now(dt.timezone.utc)
     async with aiosqlite.connect(_db_file) as db:
         await db.execute(
-            "INSERT OR REPLACE INTO leads(user_id, campaign, created_at) VALUES(?,?,?)",
-            (user_id, campaign, dt.datetime.utcnow().isoformat()),
+            "INSERT OR REPLACE INTO leads(user_id, campaign, created_at, created_at_epoch) "
+            "VALUES(?,?,?,?)",
+            (user_id, campaign, created_at.isoformat(), created_at.timestamp()),
         )
         await db.commit()
 
@@ -446,3 +477,22 @@ async def mark_lottery_claimed(user_id: int, campaign: str, claimed_at: str) ->
             (claimed_at, user_id, campaign),
         )
         await db.commit()
+
+
+async def fetch_media_file_ids() -> Dict[str, str]:
+    await init_db()
+    async with aiosqlite.connect(_db_file) as db:
+        cursor = await db.execute("SELECT path, file_id FROM media_files")
+        rows = await cursor.fetchall()
+        await cursor.close()
+        return {row[0]: row[1] for row in rows}
+
+
+async def save_media_file_id(path: str, file_id: str) -> None:
+    await init_db()
+    async with aiosqlite.connect(_db_file) as db:
+        await db.execute(
+            "REPLACE INTO media_files(path, file_id, updated_at) VALUES(?,?,?)",
+            (path, file_id, dt.datetime.utcnow().isoformat()),
+        )
+        await db.commit()
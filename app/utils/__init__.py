@@ -1,3 +1,4 @@
-from .md import bold, format_list, italic, safe_text
+from .md import bold, format_list, italic, normalize_username, safe_text
+from .tasks import spawn
 
-__all__ = ["bold", "format_list", "italic", "safe_text"]
+__all__ = ["bold", "format_list", "italic", "normalize_username", "safe_text", "spawn"]
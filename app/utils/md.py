@@ -5,11 +5,23 @@ from typing import Any, Iterable
 
 
 def safe_text(value: Any) -> str:
+    # Called several times per update, almost always with a str or None.
+    if value.__class__ is str:
+        return value.strip()
     if value is None:
         return ""
     return str(value).strip()
 
 
+def normalize_username(username: str | None) -> str:
+    """Return ``@username`` lowercased, or an empty string when there is none."""
+    if not username:
+        return ""
+    if username[0] == "@":
+        username = username.lstrip("@")
+    return f"@{username.lower()}" if username else ""
+
+
 def bold(text: Any) -> str:
     value = safe_text(text)
     return f"<b>{escape(value)}</b>"
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+_background_tasks: Set[asyncio.Task[Any]] = set()
+
+
+def spawn(coro: Coroutine[Any, Any, Any], *, name: str | None = None) -> asyncio.Task[Any]:
+    """Run ``coro`` in the background and keep a reference until it finishes."""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
+
+
+def _on_task_done(task: asyncio.Task[Any]) -> None:
+    _background_tasks.discard(task)
+    if task.cancelled():
+        return
+    exception = task.exception()
+    if exception is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=exception)
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+from app.services import coupons, sheets
+
+RECORDS = [
+    {"row": 2, "campaign": "autumn", "status": "free", "code": "A"},
+    {"row": 3, "campaign": "spring", "status": "reserved", "code": "B"},
+    {"row": 4, "campaign": "", "status": "", "code": "C"},
+    {"row": 5, "campaign": "spring", "status": "FREE", "code": "D"},
+]
+
+
+@pytest.fixture(autouse=True)
+def coupon_sheet(monkeypatch):
+    async def read(sheet):
+        return RECORDS
+
+    monkeypatch.setattr(sheets, "read", read)
+
+
+def test_first_matching_row_wins_when_several_are_free():
+    found = asyncio.run(coupons.find_first_free_coupon("spring"))
+    assert found == {"row": 4, "code": "C", "campaign": ""}
+
+
+def test_any_campaign_takes_the_first_free_row():
+    found = asyncio.run(coupons.find_first_free_coupon(None))
+    assert found == {"row": 2, "code": "A", "campaign": "autumn"}
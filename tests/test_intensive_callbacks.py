@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("aiogram")
+
+from app.handlers.intensive import _parse_callback_data
+
+
+def test_campaign_with_colon_stays_whole():
+    assert _parse_callback_data("qa_menu:spring:2025") == ("qa_menu", "spring:2025", "about")
+    assert _parse_callback_data("intensive_lead:a:b:c") == ("intensive_lead", "a:b:c", "about")
+
+
+def test_topic_is_the_last_field():
+    assert _parse_callback_data("qa_topic:spring:2025:price", with_topic=True) == (
+        "qa_topic",
+        "spring:2025",
+        "price",
+    )
+
+
+def test_missing_parts_use_defaults():
+    assert _parse_callback_data(None) == ("", "default", "about")
+    assert _parse_callback_data("qa_topic:", with_topic=True) == ("qa_topic", "default", "about")
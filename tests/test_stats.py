@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("aiogram")
+
+from app.services import sheets, sheets_writer, stats
+
+
+def test_meta_json_is_compact_unescaped_json(monkeypatch):
+    rows = []
+    monkeypatch.setattr(
+        sheets,
+        "current_timestamp",
+        lambda: sheets.SheetTimestamp(moment=None, utc_text="t", local_text="t"),
+    )
+    monkeypatch.setattr(sheets_writer, "enqueue", lambda sheet, row, **kwargs: rows.append(row))
+
+    stats.log_event_nowait(7, "", "qa_entry", {"source": "кнопка", 1: True}, username="ann")
+
+    assert rows[0]["meta_json"] == (
+        '{"source":"кнопка","1":true,"user_id":7,"campaign":"default","username":"ann"}'
+    )